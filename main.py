@@ -4,12 +4,18 @@ Author: Nawddeep
 Date: February 2026
 
 Complete end-to-end compliance checking system
+
+Usage:
+    python main.py [--pdf FILE] [--rules FILE] [--out DIR] [--max-pages N] [--jobs N]
 """
 
+import argparse
+import logging
 import sys
 import os
+import stat
 from pathlib import Path
-import json
+from concurrent.futures import ProcessPoolExecutor
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -19,6 +25,18 @@ from src.table_extractor import TableExtractor
 from src.segmentor import DocumentSegmenter
 from src.compliance_checker import ComplianceChecker
 from src.report_generator import ReportGenerator
+from src.utils import (
+    pipeline_cache_dir, pipeline_cache_path, load_cache, save_cache, write_json,
+    configure_logging, map_pdf
+)
+
+log = logging.getLogger(__name__)
+
+
+MAX_PAGES = 150           # Default: process first 150 pages
+MIN_TEXT_THRESHOLD = 1000  # Below this, fall back to OCR
+TEXT_BACKEND = "pypdfium2"  # Fast text pass
+TABLE_BACKEND = "pdfplumber"  # "pymupdf" is faster but finds slightly different tables
 
 
 def validate_pdf_input(pdf_path):
@@ -34,70 +52,174 @@ def validate_pdf_input(pdf_path):
     if not pdf_path:
         return False, "No file path provided"
     
-    if not os.path.exists(pdf_path):
+    # One stat call answers existence, type and size
+    try:
+        st = os.stat(pdf_path)
+    except FileNotFoundError:
         return False, f"File not found: {pdf_path}"
+    except OSError as e:
+        return False, f"Cannot access file: {pdf_path} ({e.strerror})"
     
-    if not os.path.isfile(pdf_path):
+    if not stat.S_ISREG(st.st_mode):
         return False, f"Path is not a file: {pdf_path}"
     
     if not pdf_path.lower().endswith('.pdf'):
         return False, f"File is not a PDF: {pdf_path}"
     
     # Check file size (warn if > 100MB)
-    file_size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+    file_size_mb = st.st_size / (1024 * 1024)
     if file_size_mb > 100:
         print(f"\n⚠️  Warning: Large file ({file_size_mb:.1f} MB) - processing may take time")
     
     return True, None
 
 
-def main():
+def _shard_pages(max_pages, jobs):
     """
-    Main execution function - Complete workflow
-    """
-    print("="*70)
-    print("🎯 FINANCIAL COMPLIANCE AI")
-    print("   IndiaAI Challenge 2026")
-    print("   Complete Compliance Analysis System")
-    print("="*70)
-    
-    # Configuration
-    RULES_PATH = "data/regulations/rules_index.json"
-    OUTPUT_DIR = "data/outputs"
+    Split the first max_pages page indices into contiguous chunks
     
-    # Create output directory
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    Args:
+        max_pages: Number of pages to process
+        jobs: Number of chunks (worker processes)
+        
+    Returns:
+        list: One list of zero-based page indices per chunk
+    """
+    chunk_size = -(-max_pages // max(1, jobs))
+    return [
+        list(range(start, min(start + chunk_size, max_pages)))
+        for start in range(0, max_pages, chunk_size)
+    ]
+
+
+# Per-worker-process PDF mappings, shared by that worker's text and table chunks
+_worker_pdfs = {}
+
+
+def _worker_pdf(pdf_path):
+    """Map the PDF once per worker process (released when the pool shuts down)"""
+    pdf = _worker_pdfs.get(pdf_path)
+    if pdf is None:
+        pdf = _worker_pdfs[pdf_path] = map_pdf(pdf_path)
+    return pdf
+
+
+def _extract_text_chunk(pdf_path, page_numbers):
+    """Worker: digital text extraction for one chunk of pages"""
+    processor = DocumentProcessor(verbose=False)
+    result = processor.extract_text_from_pdf(
+        _worker_pdf(pdf_path),
+        page_numbers=page_numbers,
+        min_text_threshold=0,  # OCR fallback is decided on the merged result
+        backend=TEXT_BACKEND
+    )
+    # The pipeline works from page_texts only - don't pickle every
+    # character twice back to the parent
+    del result['text']
+    return result
+
+
+def _extract_tables_chunk(pdf_path, page_numbers):
+    """Worker: table extraction for one chunk of pages"""
+    # One contiguous chunk per worker: each pdfplumber.open parses the whole PDF
+    extractor = TableExtractor(verbose=False, backend=TABLE_BACKEND)
+    # iter_tables, not extract_all_tables: errors must reach collect_tables
+    # instead of turning into an empty chunk
+    return list(extractor.iter_tables(_worker_pdf(pdf_path), page_numbers=page_numbers))
+
+
+def submit_chunks(executor, worker, pdf_path, max_pages, jobs):
+    """
+    Submit one extraction task per page chunk
     
-    # Validate rules file exists
-    if not os.path.exists(RULES_PATH):
-        print(f"\n❌ Error: Rules file not found: {RULES_PATH}")
-        print("   Please ensure data/regulations/rules_index.json exists")
-        return
+    Args:
+        executor: Shared ProcessPoolExecutor
+        worker: _extract_text_chunk or _extract_tables_chunk
+        pdf_path: Path to PDF file
+        max_pages: Maximum pages to process
+        jobs: Number of chunks
+        
+    Returns:
+        list: Futures in page order
+    """
+    return [
+        executor.submit(worker, pdf_path, shard)
+        for shard in _shard_pages(max_pages, jobs)
+    ]
+
+
+def collect_text(processor, futures, pdf_path, max_pages):
+    """
+    Merge chunked text extraction results
     
-    # Get PDF path
-    print("\n📄 Enter PDF file path:")
-    print("   (or press Enter for default test file)")
+    Args:
+        processor: DocumentProcessor used for merging and OCR fallback
+        futures: Futures from submit_chunks(_extract_text_chunk, ...)
+        pdf_path: Path to PDF file
+        max_pages: Maximum pages to process
+        
+    Returns:
+        Extraction result dictionary (shape of extract_text_from_pdf; 'text'
+        is only present after an OCR fallback). metadata['error'] is set
+        when a chunk failed
+    """
+    result = processor.merge_results([f.result() for f in futures], join_text=False)
     
-    pdf_path = input("   Path: ").strip()
+    # Too little digital text - OCR the same pages (the digital pass is done)
+    chars = result['metadata']['total_characters']
+    if chars < MIN_TEXT_THRESHOLD:
+        if processor.verbose:
+            print(f"   ⚠️  Only {chars} characters extracted - falling back to OCR")
+        result = processor._extract_with_ocr(pdf_path, max_pages)
     
-    if not pdf_path:
-        # Try to find any PDF in sample_documents
-        pdf_path = "data/sample_document/Dixon_2025.pdf"
-        if os.path.exists(pdf_path):
-            print(f"   Using: {os.path.basename(pdf_path)}")
+    return result
+
+
+def collect_tables(futures):
+    """
+    Merge chunked table extraction results
     
-    # Validate PDF file
-    is_valid, error_msg = validate_pdf_input(pdf_path)
-    if not is_valid:
-        print(f"\n❌ Error: {error_msg}")
-        print("\n💡 Tips:")
-        print("   • Use absolute path: /full/path/to/file.pdf")
-        print("   • Or relative path: data/sample_document/Dixon_2025.pdf")
-        print("   • Check file exists: ls -la path/to/file.pdf")
-        return
+    Args:
+        futures: Futures from submit_chunks(_extract_tables_chunk, ...)
+        
+    Returns:
+        List of table dictionaries in page order (raises if a chunk failed)
+    """
+    return [table for f in futures for table in f.result()]
+
+
+def cancel_pending(executor, futures):
+    """Cancel queued chunk tasks and release the process pool"""
+    for f in futures:
+        f.cancel()
+    executor.shutdown(wait=False)
+
+
+def analyze_document(
+    pdf_path,
+    rules_path,
+    output_dir,
+    max_pages=MAX_PAGES,
+    jobs=None,
+    extract_tables=True,
+    save_excel=True
+):
+    """
+    Run Steps 1-4 (extraction, tables, segmentation, compliance)
     
+    Args:
+        pdf_path: Path to a validated PDF file
+        rules_path: Path to rules JSON file
+        output_dir: Directory for the Excel table export
+        max_pages: Maximum pages to process
+        jobs: Worker processes (None = one per CPU core)
+        extract_tables: Run Step 2 (False skips table extraction entirely)
+        save_excel: Export extracted tables to Excel
+        
+    Returns:
+        dict with the intermediate results, or None on a fatal error
+    """
     pdf_filename = os.path.basename(pdf_path)
-    print(f"\n✅ Processing: {pdf_filename}")
     
     # ====================================================================
     # STEP 1: TEXT EXTRACTION
@@ -106,28 +228,54 @@ def main():
     print("STEP 1: DOCUMENT PROCESSING & TEXT EXTRACTION")
     print("="*70)
     
+    # Text and table extraction run concurrently in one process pool,
+    # each split into page chunks (one worker per CPU core by default)
+    jobs = jobs or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    text_futures = submit_chunks(executor, _extract_text_chunk, pdf_path, max_pages, jobs)
+    if extract_tables:
+        table_futures = submit_chunks(executor, _extract_tables_chunk, pdf_path, max_pages, jobs)
+    else:
+        table_futures = []
+    
+    # Set when a step falls back to partial results - such runs aren't cached
+    degraded = False
+    
     try:
         processor = DocumentProcessor(verbose=True)
-        extraction_result = processor.extract_text_from_pdf(
+        extraction_result = collect_text(
+            processor,
+            text_futures,
             pdf_path,
-            max_pages=150  # Process first 150 pages
+            max_pages=max_pages
         )
         
-        if not extraction_result['text']:
+        if not extraction_result['metadata'].get('total_characters'):
             print("\n❌ Error: No text extracted from PDF")
             print("   Possible reasons:")
             print("   • PDF is encrypted or password-protected")
             print("   • PDF contains only images (OCR failed)")
             print("   • PDF is corrupted")
-            return
+            cancel_pending(executor, table_futures)
+            return None
+        
+        if extraction_result['metadata'].get('error'):
+            print(f"\n⚠️  Warning: Some pages could not be extracted: {extraction_result['metadata']['error']}")
+            print("   Continuing with the extracted pages...")
+            degraded = True
         
         stats = processor.get_statistics(extraction_result)
         print(f"\n✅ Text extraction successful!")
         
+        # Later steps work from page_texts - don't keep a second full copy
+        # (DocumentProcessor.join_pages rebuilds it if ever needed)
+        extraction_result.pop('text', None)
+        
     except Exception as e:
         print(f"\n❌ Error during text extraction: {str(e)}")
         print("   Try with a different PDF or check file integrity")
-        return
+        cancel_pending(executor, table_futures)
+        return None
     
     # ====================================================================
     # STEP 2: TABLE EXTRACTION
@@ -136,26 +284,34 @@ def main():
     print("STEP 2: FINANCIAL TABLES EXTRACTION")
     print("="*70)
     
-    try:
-        extractor = TableExtractor(verbose=True)
-        tables = extractor.extract_all_tables(pdf_path, max_pages=150)
-        
-        print(f"\n✅ Table extraction complete!")
-        print(f"   📊 Found {len(tables)} tables")
-        
-        # Save tables to Excel
-        if tables:
-            excel_path = os.path.join(OUTPUT_DIR, f"tables_{pdf_filename.replace('.pdf', '.xlsx')}")
-            extractor.save_tables_to_excel(tables, excel_path)
-        else:
-            print("   ⚠️  No tables found in document")
-            excel_path = None
+    tables = []
+    excel_path = None
+    
+    if not extract_tables:
+        print("\n⏭️  Skipped: no rule needs table data and Excel export is off")
+    else:
+        try:
+            extractor = TableExtractor(verbose=True)
+            tables = collect_tables(table_futures)
             
-    except Exception as e:
-        print(f"\n⚠️  Warning: Table extraction failed: {str(e)}")
-        print("   Continuing without table data...")
-        tables = []
-        excel_path = None
+            print(f"\n✅ Table extraction complete!")
+            extractor.print_table_summary(tables)
+            
+            # Save tables to Excel
+            if not tables:
+                print("   ⚠️  No tables found in document")
+            elif save_excel:
+                excel_path = os.path.join(output_dir, f"tables_{Path(pdf_filename).stem}.xlsx")
+                extractor.save_tables_to_excel(tables, excel_path)
+                
+        except Exception as e:
+            print(f"\n⚠️  Warning: Table extraction failed: {str(e)}")
+            print("   Continuing without table data...")
+            tables = []
+            excel_path = None
+            degraded = True
+    
+    executor.shutdown()
     
     # ====================================================================
     # STEP 3: DOCUMENT SEGMENTATION
@@ -174,6 +330,7 @@ def main():
     except Exception as e:
         print(f"\n⚠️  Warning: Segmentation failed: {str(e)}")
         print("   Continuing with basic structure...")
+        degraded = True
         structure = {
             'total_pages': len(extraction_result['page_texts']),
             'sections': [],
@@ -189,12 +346,12 @@ def main():
     
     try:
         checker = ComplianceChecker(
-            rules_path=RULES_PATH,
+            rules_path=rules_path,
             verbose=True
         )
         
         compliance_results = checker.check_compliance(
-            extraction_result['text'],
+            page_texts=extraction_result['page_texts'],
             sections=structure['sections']
         )
         
@@ -203,8 +360,166 @@ def main():
     except Exception as e:
         print(f"\n❌ Error during compliance checking: {str(e)}")
         print("   Cannot continue without compliance results")
+        return None
+    
+    return {
+        'extraction_result': extraction_result,
+        'stats': stats,
+        'tables': tables,
+        'tables_extracted': extract_tables,
+        'excel_path': excel_path,
+        'structure': structure,
+        'compliance_results': compliance_results,
+        'degraded': degraded
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments
+    
+    Args:
+        argv: Argument list (None = sys.argv[1:])
+        
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Financial Compliance AI - complete compliance analysis of one PDF"
+    )
+    parser.add_argument('--pdf', default="data/sample_document/Dixon_2025.pdf",
+                        help="PDF file to analyze (default: %(default)s)")
+    parser.add_argument('--rules', default="data/regulations/rules_index.json",
+                        help="Compliance rules JSON (default: %(default)s)")
+    parser.add_argument('--out', default="data/outputs",
+                        help="Output directory for reports (default: %(default)s)")
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES,
+                        help="Maximum pages to process (default: %(default)s)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Worker processes for extraction (default: one per CPU core)")
+    parser.add_argument('--no-excel', action='store_true',
+                        help="Skip the Excel table export (and table extraction when "
+                             "no rule needs table data)")
+    
+    args = parser.parse_args(argv)
+    
+    if args.max_pages < 1:
+        parser.error("--max-pages must be at least 1")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    return args
+
+
+def main(argv=None):
+    """
+    Main execution function - Complete workflow
+    
+    Args:
+        argv: Command-line arguments (None = sys.argv[1:])
+    """
+    args = parse_args(argv)
+    
+    print("="*70)
+    print("🎯 FINANCIAL COMPLIANCE AI")
+    print("   IndiaAI Challenge 2026")
+    print("   Complete Compliance Analysis System")
+    print("="*70)
+    
+    # Configuration
+    RULES_PATH = args.rules
+    OUTPUT_DIR = args.out
+    
+    # Create output directory
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    # Validate rules file exists
+    if not os.path.exists(RULES_PATH):
+        print(f"\n❌ Error: Rules file not found: {RULES_PATH}")
+        print("   Please ensure the rules file exists or pass --rules")
         return
     
+    pdf_path = args.pdf
+    
+    # Validate PDF file
+    is_valid, error_msg = validate_pdf_input(pdf_path)
+    if not is_valid:
+        print(f"\n❌ Error: {error_msg}")
+        print("\n💡 Tips:")
+        print("   • Use absolute path: --pdf /full/path/to/file.pdf")
+        print("   • Or relative path: --pdf data/sample_document/Dixon_2025.pdf")
+        print("   • Check file exists: ls -la path/to/file.pdf")
+        return
+    
+    pdf_filename = os.path.basename(pdf_path)
+    print(f"\n✅ Processing: {pdf_filename}")
+    
+    # ====================================================================
+    # STEPS 1-4: ANALYSIS (cached per PDF + rules + backends + page limit)
+    # ====================================================================
+    # Rules only (cheap) - decides whether Step 2 is needed, and is used
+    # for recommendations later
+    checker = ComplianceChecker(rules_path=RULES_PATH, verbose=False)
+    save_excel = not args.no_excel
+    extract_tables = save_excel or checker.requires_tables()
+    
+    cache_path = pipeline_cache_path(
+        pipeline_cache_dir(OUTPUT_DIR),
+        pdf_path,
+        RULES_PATH,
+        args.max_pages,
+        backends=(TEXT_BACKEND, TABLE_BACKEND)
+    )
+    analysis = load_cache(cache_path)
+    
+    if analysis is not None and extract_tables and not analysis.get('tables_extracted', True):
+        # Cached run skipped Step 2, but tables are needed now
+        analysis = None
+    
+    cache_hit = analysis is not None
+    if cache_hit:
+        print(f"\n♻️  Cache hit - reusing previous analysis ({cache_path.name})")
+    else:
+        analysis = analyze_document(
+            pdf_path,
+            RULES_PATH,
+            OUTPUT_DIR,
+            max_pages=args.max_pages,
+            jobs=args.jobs,
+            extract_tables=extract_tables,
+            save_excel=save_excel
+        )
+        if analysis is None:
+            return
+        if analysis['degraded']:
+            print("\n⚠️  A step fell back to partial results - not caching this run")
+        else:
+            try:
+                save_cache(cache_path, analysis)
+            except Exception as e:
+                print(f"   ⚠️  Could not write analysis cache: {str(e)}")
+    
+    stats = analysis['stats']
+    tables = analysis['tables']
+    tables_extracted = analysis.get('tables_extracted', True)
+    structure = analysis['structure']
+    compliance_results = analysis['compliance_results']
+    
+    if cache_hit:
+        # Report the time of this run, not of the cached one
+        compliance_results['timestamp'] = checker._get_timestamp()
+    
+    # On a cache hit the workbook on disk may come from another run (e.g. a
+    # different page limit) - always re-export the cached tables
+    excel_path = None if cache_hit else analysis.get('excel_path')
+    if cache_hit and save_excel and tables:
+        excel_path = os.path.join(OUTPUT_DIR, f"tables_{Path(pdf_filename).stem}.xlsx")
+        try:
+            TableExtractor(verbose=False).save_tables_to_excel(tables, excel_path)
+        except Exception as e:
+            print(f"   ⚠️  Could not export tables to Excel: {str(e)}")
+            excel_path = None
+    
     # ====================================================================
     # STEP 5: REPORT GENERATION
     # ====================================================================
@@ -217,7 +532,7 @@ def main():
         generator = ReportGenerator(verbose=True)
         html_report_path = os.path.join(
             OUTPUT_DIR, 
-            f"compliance_report_{pdf_filename.replace('.pdf', '.html')}"
+            f"compliance_report_{Path(pdf_filename).stem}.html"
         )
         
         generator.generate_html_report(
@@ -230,7 +545,7 @@ def main():
         # JSON Report (for data analysis)
         json_report_path = os.path.join(
             OUTPUT_DIR,
-            f"compliance_data_{pdf_filename.replace('.pdf', '.json')}"
+            f"compliance_data_{Path(pdf_filename).stem}.json"
         )
         
         report_data = {
@@ -240,12 +555,11 @@ def main():
                 'total_pages': structure['total_pages'],
                 'sections_found': structure['metadata']['sections_found']
             },
-            'tables_found': len(tables),
+            'tables_found': len(tables) if tables_extracted else None,
             'compliance_results': compliance_results
         }
         
-        with open(json_report_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        write_json(json_report_path, report_data)
         
         print(f"   ✅ JSON data saved: {json_report_path}")
         
@@ -298,11 +612,12 @@ def main():
 
 
 if __name__ == "__main__":
+    configure_logging()
+    
     try:
         main()
     except KeyboardInterrupt:
         print("\n\n⚠️  Process interrupted by user")
     except Exception as e:
         print(f"\n\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Run failed")
@@ -9,13 +9,45 @@ Features:
 - Weighted scoring system
 - Detailed explanations
 - Evidence tracking
+- Single-pass multi-keyword scan (Hyperscan/Vectorscan or Aho-Corasick
+  when installed)
 """
 
 import json
 import re
-from typing import Dict, List, Optional
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 from pathlib import Path
 
+try:
+    import hyperscan
+except ImportError:  # optional dependency
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+
+class Check(NamedTuple):
+    """One rule check with its defaults resolved at rule-load time"""
+    id: str
+    requirement: str
+    keywords: List[str]             # as written in the rules (reported back)
+    keywords_lower: Tuple[str, ...]  # search form, longest first
+    weight: int
+    mandatory: bool
+
+
+class Standard(NamedTuple):
+    """One standard of the rules file with its checks"""
+    id: str
+    name: str
+    category: str
+    priority: str
+    checks: Tuple[Check, ...]
+
 
 class ComplianceChecker:
     """
@@ -38,13 +70,25 @@ class ComplianceChecker:
         
         self.rules_path = rules_path
         self.rules = self._load_rules()
+        self._standards = self._index_rules()
+        self._total_checks = sum(len(standard.checks) for standard in self._standards)
+        self._total_weight = sum(
+            check.weight for standard in self._standards for check in standard.checks
+        )
+        self._keywords = self._collect_keywords()
+        self._keyword_db = self._build_keyword_db()
+        # Scratch space is allocated once per checker; every scan works on a
+        # clone, as one scratch must not be used by two threads at a time
+        self._keyword_scratch = (
+            hyperscan.Scratch(self._keyword_db) if self._keyword_db is not None else None
+        )
+        self._automaton = self._build_automaton() if self._keyword_db is None else None
         
         if self.verbose:
             total_standards = len(self.rules)
-            total_checks = sum(len(std['checks']) for std in self.rules.values())
             print(f"✅ Compliance Checker initialized")
             print(f"   📋 Loaded {total_standards} standards")
-            print(f"   🔍 Total checks: {total_checks}")
+            print(f"   🔍 Total checks: {self._total_checks}")
     
     def _load_rules(self) -> Dict:
         """
@@ -71,6 +115,162 @@ class ComplianceChecker:
             print(f"   ❌ Invalid JSON in rules file: {e}")
             return self._get_default_rules()
     
+    def requires_tables(self) -> bool:
+        """
+        Check whether any rule needs extracted table data
+        
+        A check opts in with "requires_table": true or "kind": "table".
+        
+        Returns:
+            True if table extraction is needed for these rules
+        """
+        return any(
+            check.get('requires_table') or check.get('kind') == 'table'
+            for standard_info in self.rules.values()
+            for check in standard_info['checks']
+        )
+    
+    def _index_rules(self) -> Tuple[Standard, ...]:
+        """
+        Resolve the rules into Standard/Check tuples once per load
+        
+        Defaults (weight 5, mandatory, general/MEDIUM) and the lowercase
+        keywords (sorted longest first) are worked out here, so
+        check_compliance does no per-document dictionary lookups.
+        
+        Returns:
+            Standards in rules file order
+        """
+        return tuple(
+            Standard(
+                id=standard_id,
+                name=standard_info['name'],
+                category=standard_info.get('category', 'general'),
+                priority=standard_info.get('priority', 'MEDIUM'),
+                checks=tuple(
+                    Check(
+                        id=check['id'],
+                        requirement=check['requirement'],
+                        keywords=check['keywords'],
+                        # Longest (most specific) keyword first: it gives the
+                        # best evidence, and long needles are skipped fastest
+                        keywords_lower=tuple(sorted(
+                            (k.lower() for k in check['keywords']), key=len, reverse=True
+                        )),
+                        weight=check.get('weight', 5),
+                        mandatory=check.get('mandatory', True)
+                    )
+                    for check in standard_info['checks']
+                )
+            )
+            for standard_id, standard_info in self.rules.items()
+        )
+    
+    def _collect_keywords(self) -> List[str]:
+        """
+        Collect the unique lowercase keywords of all checks
+        
+        Returns:
+            Keyword list (the index is the keyword's pattern id)
+        """
+        keywords = {}
+        for standard in self._standards:
+            for check in standard.checks:
+                for keyword in check.keywords_lower:
+                    keywords.setdefault(keyword, len(keywords))
+        
+        return list(keywords)
+    
+    def _build_keyword_db(self):
+        """
+        Compile every rule keyword into one Hyperscan database
+        
+        Returns:
+            Database, or None when hyperscan is not installed or
+            compilation fails
+        """
+        if hyperscan is None or not self._keywords:
+            return None
+        
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[re.escape(k).encode('utf-8') for k in self._keywords],
+                ids=list(range(len(self._keywords))),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self._keywords)
+            )
+        except Exception as e:
+            if self.verbose:
+                print(f"   ⚠️  Hyperscan unavailable: {e}")
+            return None
+        
+        return db
+    
+    def _build_automaton(self):
+        """
+        Build one Aho-Corasick automaton over every rule keyword
+        
+        Returns:
+            pyahocorasick Automaton, or None when not installed
+        """
+        if ahocorasick is None or not self._keywords:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword_id, keyword in enumerate(self._keywords):
+            automaton.add_word(keyword, keyword_id)
+        automaton.make_automaton()
+        
+        return automaton
+    
+    def _scan_keywords(self, text: str) -> Optional[Dict[str, Optional[int]]]:
+        """
+        Find every rule keyword that occurs in the text in a single pass
+        
+        Args:
+            text: Document text (lowercase)
+        
+        Returns:
+            {keyword: index of its first occurrence} for the keywords found
+            (the index is None when it must still be located with
+            str.find), or None when neither Hyperscan nor Aho-Corasick is
+            available
+        """
+        hits = {}
+        
+        if self._keyword_db is not None:
+            # Byte offsets equal character offsets only for ASCII text
+            ascii_text = text.isascii()
+            total = len(self._keywords)
+            
+            def on_match(pattern_id, start, end, flags, context):
+                keyword = self._keywords[pattern_id]
+                context[keyword] = end - len(keyword) if ascii_text else None
+                # A true return value halts the scan once every keyword is found
+                return len(context) == total
+            
+            try:
+                self._keyword_db.scan(
+                    text.encode('utf-8'),
+                    match_event_handler=on_match,
+                    context=hits,
+                    scratch=self._keyword_scratch.clone()
+                )
+            except hyperscan.ScanTerminated:
+                pass
+            return hits
+        
+        if self._automaton is not None:
+            for end_index, keyword_id in self._automaton.iter(text):
+                keyword = self._keywords[keyword_id]
+                if keyword not in hits:
+                    hits[keyword] = end_index - len(keyword) + 1
+                    if len(hits) == len(self._keywords):
+                        break
+            return hits
+        
+        return None
+    
     def _get_default_rules(self) -> Dict:
         """
         Minimal default rules if file not found
@@ -90,10 +290,47 @@ class ComplianceChecker:
             }
         }
     
+    @staticmethod
+    def prepare_text(
+        document_text: Optional[str] = None,
+        page_texts: Optional[List[Dict]] = None
+    ) -> Tuple[str, int]:
+        """
+        Build the lowercase search copy of a document
+        
+        check_compliance calls this itself; callers checking one document
+        against several rule sets can call it once and pass the result as
+        prepared_text to every checker.
+        
+        Args:
+            document_text: Full document text
+            page_texts: Page dictionaries from DocumentProcessor, used
+                instead of document_text (lowered page by page, the full
+                text is never built)
+        
+        Returns:
+            (lowercase text, original document length)
+        """
+        if document_text is not None:
+            return document_text.lower(), len(document_text)
+        
+        if page_texts is None:
+            raise ValueError("Provide document_text or page_texts")
+        
+        text_lower = "".join(
+            p['text'].lower() + "\n\n" for p in page_texts if p['text']
+        )
+        document_length = sum(len(p['text']) + 2 for p in page_texts if p['text'])
+        
+        return text_lower, document_length
+    
     def check_compliance(
         self, 
-        document_text: str,
-        sections: Optional[Dict] = None
+        document_text: Optional[str] = None,
+        sections: Optional[Dict] = None,
+        page_texts: Optional[List[Dict]] = None,
+        prepared_text: Optional[Tuple[str, int]] = None,
+        short_circuit: Optional[Callable[[Dict, Dict, Dict], bool]] = None
     ) -> Dict:
         """
         Main compliance checking function
@@ -101,57 +338,71 @@ class ComplianceChecker:
         Args:
             document_text: Full document text
             sections: Optional pre-segmented document sections
+            page_texts: Page dictionaries from DocumentProcessor, used
+                instead of document_text (the full text is never built,
+                only its lowercase search copy)
+            prepared_text: prepare_text() output, used instead of both
+                (skips lowercasing the document again)
+            short_circuit: Optional callback(summary, standard_result,
+                check_result) run after every check; returning True stops
+                checking (e.g. fail_on_high_priority_mandatory). The
+                results are then tagged 'short_circuited' and the checks
+                not run count as not achieved, so the score is a lower bound
         
         Returns:
             Compliance results dictionary
         """
-        if self.verbose:
-            print("\n" + "="*70)
-            print("🔍 RUNNING COMPLIANCE CHECKS")
-            print("="*70)
+        if prepared_text is None:
+            prepared_text = self.prepare_text(document_text, page_texts)
+        document_text_lower, document_length = prepared_text
+        
+        # Verbose output is collected and written once at the end instead
+        # of one print per check
+        log_lines = [] if self.verbose else None
+        
+        if log_lines is not None:
+            log_lines.append("\n" + "="*70)
+            log_lines.append("🔍 RUNNING COMPLIANCE CHECKS")
+            log_lines.append("="*70)
         
-        # Prepare text for searching
-        document_text_lower = document_text.lower()
+        keyword_hits = self._scan_keywords(document_text_lower)
         
         # Initialize results
         all_results = []
+        non_compliant = []
+        stopped = False
         summary = {
-            'total_checks': 0,
+            'total_checks': self._total_checks,
             'compliant': 0,
             'non_compliant': 0,
             'missing': 0,
-            'total_weight': 0,
+            'total_weight': self._total_weight,
             'achieved_weight': 0
         }
         
         # Check each standard
-        for standard_id, standard_info in self.rules.items():
-            if self.verbose:
-                print(f"\n📌 {standard_id}: {standard_info['name']}")
-                print("-"*70)
+        for standard in self._standards:
+            if log_lines is not None:
+                log_lines.append(f"\n📌 {standard.id}: {standard.name}")
+                log_lines.append("-"*70)
             
             standard_results = {
-                'standard_id': standard_id,
-                'standard_name': standard_info['name'],
-                'category': standard_info.get('category', 'general'),
-                'priority': standard_info.get('priority', 'MEDIUM'),
+                'standard_id': standard.id,
+                'standard_name': standard.name,
+                'category': standard.category,
+                'priority': standard.priority,
                 'checks': [],
                 'compliant_count': 0,
-                'total_count': 0
+                'total_count': len(standard.checks)
             }
             
             # Check each requirement
-            for check in standard_info['checks']:
-                summary['total_checks'] += 1
-                standard_results['total_count'] += 1
-                
-                weight = check.get('weight', 5)
-                summary['total_weight'] += weight
-                
+            for check in standard.checks:
                 # Search for keywords
                 found, evidence = self._search_keywords(
                     document_text_lower,
-                    check['keywords']
+                    check.keywords_lower,
+                    keyword_hits
                 )
                 
                 # Determine status
@@ -159,41 +410,53 @@ class ComplianceChecker:
                     status = "COMPLIANT"
                     symbol = "✅"
                     summary['compliant'] += 1
-                    summary['achieved_weight'] += weight
+                    summary['achieved_weight'] += check.weight
                     standard_results['compliant_count'] += 1
+                elif check.mandatory:
+                    status = "NON-COMPLIANT"
+                    symbol = "❌"
+                    summary['non_compliant'] += 1
                 else:
-                    if check.get('mandatory', True):
-                        status = "NON-COMPLIANT"
-                        symbol = "❌"
-                        summary['non_compliant'] += 1
-                    else:
-                        status = "MISSING"
-                        symbol = "⚠️"
-                        summary['missing'] += 1
+                    status = "MISSING"
+                    symbol = "⚠️"
+                    summary['missing'] += 1
                 
                 # Store check result
                 check_result = {
-                    'check_id': check['id'],
-                    'requirement': check['requirement'],
+                    'check_id': check.id,
+                    'requirement': check.requirement,
                     'status': status,
                     'symbol': symbol,
-                    'mandatory': check.get('mandatory', True),
-                    'weight': weight,
+                    'mandatory': check.mandatory,
+                    'weight': check.weight,
                     'evidence': evidence,
-                    'keywords_searched': check['keywords']
+                    'keywords_searched': check.keywords
                 }
                 
                 standard_results['checks'].append(check_result)
                 
+                item = self.non_compliant_item(standard_results, check_result)
+                if item is not None:
+                    non_compliant.append(item)
+                
                 # Print result
-                if self.verbose:
-                    print(f"   {symbol} {status:15} - {check['requirement']}")
+                if log_lines is not None:
+                    log_lines.append(f"   {symbol} {status:15} - {check.requirement}")
                     if evidence:
                         # Truncate evidence for display
                         evidence_preview = evidence[:80] + "..." if len(evidence) > 80 else evidence
-                        print(f"      💡 Evidence: '{evidence_preview}'")
+                        log_lines.append(f"      💡 Evidence: '{evidence_preview}'")
+                
+                if short_circuit is not None and short_circuit(summary, standard_results, check_result):
+                    stopped = True
+                    break
             
             all_results.append(standard_results)
+            
+            if stopped:
+                if log_lines is not None:
+                    log_lines.append(f"\n⏹️  Stopped early after {check.id}")
+                break
         
         # Calculate compliance score
         if summary['total_weight'] > 0:
@@ -204,72 +467,127 @@ class ComplianceChecker:
         summary['compliance_score'] = round(compliance_score, 2)
         
         # Print summary
-        if self.verbose:
+        if log_lines is not None:
+            sys.stdout.write("\n".join(log_lines) + "\n")
             self._print_summary(summary)
         
-        return {
+        results = {
             'summary': summary,
             'detailed_results': all_results,
-            'document_length': len(document_text),
+            'non_compliant_items': non_compliant,
+            'document_length': document_length,
             'timestamp': self._get_timestamp()
         }
+        if stopped:
+            results['short_circuited'] = True
+        
+        return results
+    
+    @staticmethod
+    def fail_on_high_priority_mandatory(summary: Dict, standard: Dict, check: Dict) -> bool:
+        """
+        short_circuit callback: stop at the first failed mandatory check
+        of a HIGH priority standard (pass/fail gating)
+        
+        Args:
+            summary: Running summary
+            standard: Standard result being filled
+            check: Check result just added
+        
+        Returns:
+            True to stop checking
+        """
+        return standard['priority'] == 'HIGH' and check['status'] == 'NON-COMPLIANT'
+    
+    def check_compliance_batch(
+        self,
+        documents: Iterable[Union[str, List[Dict]]],
+        short_circuit: Optional[Callable[[Dict, Dict, Dict], bool]] = None
+    ) -> Iterator[Dict]:
+        """
+        Check many documents against the same rules
+        
+        The rules index, keyword database/automaton and Hyperscan scratch
+        are built once in __init__ and shared by every document; results
+        are yielded one at a time so only one document is held at once.
+        
+        Args:
+            documents: Document texts, or page_texts lists from
+                DocumentProcessor
+            short_circuit: Passed to check_compliance for every document
+        
+        Returns:
+            Iterator of check_compliance results, in input order
+        """
+        for document in documents:
+            if isinstance(document, str):
+                yield self.check_compliance(document_text=document, short_circuit=short_circuit)
+            else:
+                yield self.check_compliance(page_texts=document, short_circuit=short_circuit)
     
     def _search_keywords(
         self, 
         text: str, 
-        keywords: List[str]
+        keywords: Sequence[str],
+        keyword_hits: Optional[Dict[str, Optional[int]]] = None
     ) -> tuple:
         """
         Search for keywords in text
         
         Args:
             text: Document text (lowercase)
-            keywords: List of keywords to search
+            keywords: Lowercase keywords to search (pre-lowered per check
+                in _index_rules)
+            keyword_hits: Keyword positions from _scan_keywords
+                (None = search the text directly)
         
         Returns:
             (found: bool, evidence: str or None)
         """
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
+        for keyword_lower in keywords:
+            if keyword_hits is not None:
+                if keyword_lower not in keyword_hits:
+                    continue
+                index = keyword_hits[keyword_lower]
+            else:
+                index = None
             
-            if keyword_lower in text:
-                # Find context around the keyword
-                evidence = self._extract_context(text, keyword_lower)
-                return (True, evidence)
+            if index is None:
+                # Plain substring search (faster than a regex alternation)
+                index = text.find(keyword_lower)
+                if index == -1:
+                    continue
+            
+            # Find context around the keyword
+            evidence = self._extract_context(text, index, index + len(keyword_lower))
+            return (True, evidence)
         
         return (False, None)
     
     def _extract_context(
         self, 
         text: str, 
-        keyword: str,
+        start: int,
+        end: int,
         context_length: int = 100
     ) -> str:
         """
-        Extract context around found keyword
+        Extract context around a keyword match
         
         Args:
             text: Full text
-            keyword: Found keyword
+            start: Match start index
+            end: Match end index
             context_length: Characters before/after
         
         Returns:
-            Context string
+            Context string (whitespace collapsed)
         """
-        index = text.find(keyword)
-        
-        if index == -1:
-            return keyword
-        
-        start = max(0, index - context_length)
-        end = min(len(text), index + len(keyword) + context_length)
+        context_start = max(0, start - context_length)
+        context_end = min(len(text), end + context_length)
         
-        context = text[start:end].strip()
-        
-        # Clean up
-        context = " ".join(context.split())
-        
-        return context
+        # Collapse whitespace (split/join is faster than re.sub here)
+        return " ".join(text[context_start:context_end].split())
     
     def _print_summary(self, summary: Dict):
         """
@@ -311,6 +629,27 @@ class ComplianceChecker:
         from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    def non_compliant_item(self, standard: Dict, check: Dict) -> Optional[Dict]:
+        """
+        Summarize one check result if it is a compliance gap
+        
+        Args:
+            standard: Standard entry from detailed_results
+            check: Check entry of that standard
+        
+        Returns:
+            Non-compliant item dictionary, or None if the check passed
+        """
+        if check['status'] not in ['NON-COMPLIANT', 'MISSING']:
+            return None
+        
+        return {
+            'standard': standard['standard_name'],
+            'requirement': check['requirement'],
+            'status': check['status'],
+            'priority': standard['priority']
+        }
+    
     def get_non_compliant_items(self, results: Dict) -> List[Dict]:
         """
         Extract all non-compliant items
@@ -321,32 +660,39 @@ class ComplianceChecker:
         Returns:
             List of non-compliant items
         """
+        # Collected by check_compliance in the same pass as the checks
+        if 'non_compliant_items' in results:
+            return results['non_compliant_items']
+        
         non_compliant = []
         
         for standard in results['detailed_results']:
             for check in standard['checks']:
-                if check['status'] in ['NON-COMPLIANT', 'MISSING']:
-                    non_compliant.append({
-                        'standard': standard['standard_name'],
-                        'requirement': check['requirement'],
-                        'status': check['status'],
-                        'priority': standard['priority']
-                    })
+                item = self.non_compliant_item(standard, check)
+                if item is not None:
+                    non_compliant.append(item)
         
         return non_compliant
     
-    def generate_recommendations(self, results: Dict) -> List[str]:
+    def generate_recommendations(
+        self,
+        results: Dict,
+        non_compliant: Optional[List[Dict]] = None
+    ) -> List[str]:
         """
         Generate recommendations based on compliance gaps
         
         Args:
             results: Compliance check results
+            non_compliant: Pre-collected get_non_compliant_items() output
+                (None = take it from results)
         
         Returns:
             List of recommendations
         """
         recommendations = []
-        non_compliant = self.get_non_compliant_items(results)
+        if non_compliant is None:
+            non_compliant = self.get_non_compliant_items(results)
         
         # High priority issues
         high_priority = [nc for nc in non_compliant if nc['priority'] == 'HIGH']
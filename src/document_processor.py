@@ -4,8 +4,8 @@ Author: Nawddeep
 Date: February 2026
 
 Features:
-- Digital PDF text extraction (pdfplumber)
-- OCR for scanned PDFs (Tesseract)
+- Digital PDF text extraction (pypdfium2, PyMuPDF or pdfplumber)
+- OCR for scanned PDFs (Tesseract, pages in parallel)
 - Automatic fallback mechanism
 - Page-wise text tracking
 - Metadata extraction
@@ -13,10 +13,28 @@ Features:
 
 import pdfplumber
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import (
+    convert_from_path, convert_from_bytes, pdfinfo_from_path, pdfinfo_from_bytes
+)
 from PIL import Image
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Union
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional dependency (normally installed with pdfplumber)
+    pdfium = None
+
+try:
+    import pymupdf
+except ImportError:  # optional dependency
+    pymupdf = None
+
+try:
+    from .utils import open_pymupdf, pdfium_input, pdfium_page_text
+except ImportError:  # run as a script (python src/document_processor.py)
+    from utils import open_pymupdf, pdfium_input, pdfium_page_text
 
 
 class DocumentProcessor:
@@ -33,23 +51,33 @@ class DocumentProcessor:
         """
         self.verbose = verbose
         self.supported_formats = ['.pdf', '.PDF']
+        self.text_backends = ['auto', 'pypdfium2', 'pymupdf', 'pdfplumber']
         
         if self.verbose:
             print("📄 Document Processor initialized")
     
     def extract_text_from_pdf(
         self, 
-        pdf_path: str, 
+        pdf_path: Union[str, BinaryIO], 
         max_pages: Optional[int] = None,
-        min_text_threshold: int = 1000
+        min_text_threshold: int = 1000,
+        page_numbers: Optional[List[int]] = None,
+        backend: str = 'auto'
     ) -> Dict:
         """
         Main extraction method with automatic fallback
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file, or an open binary buffer such as
+                utils.map_pdf() (no path validation is done for buffers)
             max_pages: Maximum pages to process (None = all)
             min_text_threshold: Minimum characters for digital extraction
+                (0 disables the OCR fallback)
+            page_numbers: Zero-based page indices to process instead of
+                the first max_pages (used for chunked/parallel extraction)
+            backend: Digital text parser - 'pypdfium2' or 'pymupdf' (native
+                code, several times faster), 'pdfplumber' (layout-aware,
+                pure Python) or 'auto' (fastest installed)
         
         Returns:
             dict: {
@@ -58,20 +86,25 @@ class DocumentProcessor:
                 'metadata': dict       # Extraction metadata
             }
         """
+        is_path = isinstance(pdf_path, str)
+        
         if self.verbose:
             print(f"\n{'='*70}")
-            print(f"📥 Processing: {os.path.basename(pdf_path)}")
+            print(f"📥 Processing: {os.path.basename(pdf_path) if is_path else 'in-memory PDF'}")
             print(f"{'='*70}")
         
         # Validate file
-        if not os.path.exists(pdf_path):
+        if is_path and not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
         
-        if not any(pdf_path.endswith(ext) for ext in self.supported_formats):
+        if is_path and not any(pdf_path.endswith(ext) for ext in self.supported_formats):
             raise ValueError(f"Unsupported format. Use: {self.supported_formats}")
         
+        if backend not in self.text_backends:
+            raise ValueError(f"Unsupported backend. Use: {self.text_backends}")
+        
         # Try digital extraction first
-        result = self._extract_digital_text(pdf_path, max_pages)
+        result = self._extract_digital_text(pdf_path, max_pages, page_numbers, backend)
         
         # Fallback to OCR if needed
         if len(result['text']) < min_text_threshold:
@@ -86,41 +119,74 @@ class DocumentProcessor:
     
     def _extract_digital_text(
         self, 
-        pdf_path: str, 
-        max_pages: Optional[int]
+        pdf_path: Union[str, BinaryIO], 
+        max_pages: Optional[int],
+        page_numbers: Optional[List[int]] = None,
+        backend: str = 'auto',
+        stop_after_chars: Optional[int] = None
     ) -> Dict:
         """
-        Extract text from digital PDF using pdfplumber
+        Extract text from digital PDF using pypdfium2, PyMuPDF or pdfplumber
         
         Args:
-            pdf_path: Path to PDF
+            pdf_path: Path to PDF or open binary buffer
             max_pages: Pages to process
+            page_numbers: Explicit zero-based page indices (overrides max_pages)
+            backend: 'auto', 'pypdfium2', 'pymupdf' or 'pdfplumber'
+            stop_after_chars: Stop early once this many characters have been
+                extracted (None = process every page)
         
         Returns:
             Extraction result dictionary
         """
+        backend = self._resolve_backend(backend)
+        
         if self.verbose:
-            print("   📖 Method: Digital extraction (pdfplumber)")
+            print(f"   📖 Method: Digital extraction ({backend})")
         
-        full_text = ""
+        text_parts = []
         page_texts = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
+            # PDFium and MuPDF are not thread-safe, not even with one document
+            # handle per thread, so pages are never read from multiple threads.
+            # Parallel extraction runs page chunks in separate processes
+            # (page_numbers + merge_results, see main.py).
+            if backend == 'pypdfium2':
+                pdf = pdfium.PdfDocument(pdfium_input(pdf_path))
+                read_page = lambda i: pdfium_page_text(pdf, i)
+                total_pages = len(pdf)
+            elif backend == 'pymupdf':
+                pdf = open_pymupdf(pdf_path)
+                read_page = lambda i: pdf.load_page(i).get_text("text").strip()
+                total_pages = len(pdf)
+            else:
+                pdf = pdfplumber.open(pdf_path)
+                read_page = lambda i: pdf.pages[i].extract_text()
                 total_pages = len(pdf.pages)
-                pages_to_process = min(max_pages or total_pages, total_pages)
+            
+            try:
+                if page_numbers is not None:
+                    page_indices = [i for i in page_numbers if 0 <= i < total_pages]
+                else:
+                    page_indices = range(min(max_pages or total_pages, total_pages))
+                pages_to_process = len(page_indices)
                 
                 if self.verbose:
                     print(f"   📄 Total pages: {total_pages}")
                     print(f"   🔢 Processing: {pages_to_process} pages")
                 
                 # Extract from each page
-                for i in range(pages_to_process):
-                    page = pdf.pages[i]
-                    page_text = page.extract_text()
+                chars = 0
+                for done, i in enumerate(page_indices, 1):
+                    if stop_after_chars is not None and chars >= stop_after_chars:
+                        break
+                    
+                    page_text = read_page(i)
                     
                     if page_text:
-                        full_text += page_text + "\n\n"
+                        chars += len(page_text) + 2
+                        text_parts.append(page_text + "\n\n")
                         page_texts.append({
                             'page_num': i + 1,
                             'text': page_text,
@@ -138,28 +204,38 @@ class DocumentProcessor:
                         })
                     
                     # Progress indicator
-                    if self.verbose and (i + 1) % 20 == 0:
-                        print(f"   ⏳ Progress: {i + 1}/{pages_to_process} pages")
-                
-                # Summary
-                if self.verbose:
-                    print(f"   ✅ Extraction complete")
-                    print(f"   📊 Characters: {len(full_text):,}")
-                    print(f"   📊 Words: {len(full_text.split()):,}")
-                    print(f"   📊 Pages with text: {len([p for p in page_texts if p['char_count'] > 0])}")
-                
-                return {
-                    'text': full_text,
-                    'page_texts': page_texts,
-                    'metadata': {
-                        'total_pages': total_pages,
-                        'processed_pages': pages_to_process,
-                        'method': 'digital',
-                        'pages_with_text': len([p for p in page_texts if p['char_count'] > 0]),
-                        'total_characters': len(full_text),
-                        'total_words': len(full_text.split())
-                    }
+                    if self.verbose and done % 20 == 0:
+                        print(f"   ⏳ Progress: {done}/{pages_to_process} pages")
+            finally:
+                pdf.close()
+            
+            full_text = "".join(text_parts)
+            del text_parts
+            
+            # Pages are joined by whitespace, so page word counts add up
+            word_count = sum(p['word_count'] for p in page_texts)
+            pages_with_text = sum(1 for p in page_texts if p['char_count'] > 0)
+            
+            # Summary
+            if self.verbose:
+                print(f"   ✅ Extraction complete")
+                print(f"   📊 Characters: {len(full_text):,}")
+                print(f"   📊 Words: {word_count:,}")
+                print(f"   📊 Pages with text: {pages_with_text}")
+            
+            return {
+                'text': full_text,
+                'page_texts': page_texts,
+                'metadata': {
+                    'total_pages': total_pages,
+                    'processed_pages': len(page_texts),
+                    'method': 'digital',
+                    'backend': backend,
+                    'pages_with_text': pages_with_text,
+                    'total_characters': len(full_text),
+                    'total_words': word_count
                 }
+            }
         
         except Exception as e:
             if self.verbose:
@@ -174,16 +250,75 @@ class DocumentProcessor:
                 }
             }
     
+    def probe_digital(
+        self,
+        pdf_path: Union[str, BinaryIO],
+        sample_pages: int = 3,
+        min_text_threshold: int = 1000,
+        backend: str = 'auto'
+    ) -> bool:
+        """
+        Cheaply decide whether a PDF has a usable text layer
+        
+        Extracts at most the first sample_pages pages and stops as soon as
+        min_text_threshold characters are found. Useful for routing many
+        PDFs to digital extraction or OCR before committing to a full pass
+        (a scanned cover page followed by digital pages can misclassify).
+        
+        Args:
+            pdf_path: Path to PDF file or open binary buffer
+            sample_pages: Pages to sample from the start
+            min_text_threshold: Characters needed to count as digital
+            backend: 'auto', 'pypdfium2', 'pymupdf' or 'pdfplumber'
+        
+        Returns:
+            True if the sample reaches the threshold
+        """
+        verbose, self.verbose = self.verbose, False
+        try:
+            result = self._extract_digital_text(
+                pdf_path,
+                sample_pages,
+                backend=backend,
+                stop_after_chars=min_text_threshold
+            )
+        finally:
+            self.verbose = verbose
+        
+        return len(result['text']) >= min_text_threshold
+    
+    def _resolve_backend(self, backend: str) -> str:
+        """
+        Map 'auto' or an uninstalled backend to an available one
+        
+        Args:
+            backend: Requested backend
+        
+        Returns:
+            'pypdfium2', 'pymupdf' or 'pdfplumber'
+        """
+        available = {'pypdfium2': pdfium is not None, 'pymupdf': pymupdf is not None}
+        
+        if backend == 'auto':
+            return next((name for name, ok in available.items() if ok), 'pdfplumber')
+        
+        if not available.get(backend, True):
+            if self.verbose:
+                print(f"   ⚠️  {backend} not installed - using pdfplumber")
+            return 'pdfplumber'
+        
+        return backend
+    
     def _extract_with_ocr(
         self, 
-        pdf_path: str, 
+        pdf_path: Union[str, BinaryIO], 
         max_pages: int = 10
     ) -> Dict:
         """
         Extract text using Tesseract OCR
         
         Args:
-            pdf_path: Path to PDF
+            pdf_path: Path to PDF or open binary buffer
             max_pages: Maximum pages for OCR (default: 10)
         
         Returns:
@@ -193,58 +328,83 @@ class DocumentProcessor:
             print("   🔍 Method: OCR (Tesseract)")
             print(f"   ⚠️  OCR limited to {max_pages} pages (performance)")
         
-        full_text = ""
+        text_parts = []
         page_texts = []
         
         try:
-            # Convert PDF to images
-            if self.verbose:
-                print("   📸 Converting PDF to images...")
+            # Pages are rendered one at a time inside the OCR workers, so
+            # rendering overlaps with OCR and only one image per worker is
+            # alive at a time
+            if isinstance(pdf_path, str):
+                page_count = pdfinfo_from_path(pdf_path)['Pages']
+                render_page = lambda n: convert_from_path(
+                    pdf_path,
+                    first_page=n,
+                    last_page=n,
+                    dpi=300,  # Higher DPI for better OCR
+                    grayscale=True  # 8-bit: tesseract works on gray anyway
+                )[0]
+            else:
+                pdf_path.seek(0)
+                pdf_bytes = pdf_path.read()
+                page_count = pdfinfo_from_bytes(pdf_bytes)['Pages']
+                render_page = lambda n: convert_from_bytes(
+                    pdf_bytes,
+                    first_page=n,
+                    last_page=n,
+                    dpi=300,
+                    grayscale=True
+                )[0]
             
-            images = convert_from_path(
-                pdf_path, 
-                first_page=1, 
-                last_page=max_pages,
-                dpi=300  # Higher DPI for better OCR
-            )
+            pages = min(max_pages, page_count)
+            
+            def ocr_page(page_num):
+                return pytesseract.image_to_string(render_page(page_num), lang='eng')
+            
+            # Each pytesseract call runs its own tesseract process (and
+            # pdf2image its own pdftoppm), so threads are enough
+            workers = max(1, min(pages, os.cpu_count() or 1))
             
             if self.verbose:
-                print(f"   🖼️  Converted {len(images)} pages to images")
+                print(f"   📸 Rendering + OCR of {pages} pages ({workers} workers)...")
             
-            # OCR each image
-            for i, img in enumerate(images):
-                if self.verbose:
-                    print(f"   🔍 OCR page {i + 1}/{len(images)}...", end=" ")
-                
-                # Perform OCR
-                page_text = pytesseract.image_to_string(img, lang='eng')
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                ocr_texts = executor.map(ocr_page, range(1, pages + 1))
                 
-                full_text += page_text + "\n\n"
-                page_texts.append({
-                    'page_num': i + 1,
-                    'text': page_text,
-                    'char_count': len(page_text),
-                    'word_count': len(page_text.split())
-                })
-                
-                if self.verbose:
-                    print(f"({len(page_text)} chars)")
+                for i, page_text in enumerate(ocr_texts):
+                    if self.verbose:
+                        print(f"   🔍 OCR page {i + 1}/{pages}...", end=" ")
+                    
+                    text_parts.append(page_text + "\n\n")
+                    page_texts.append({
+                        'page_num': i + 1,
+                        'text': page_text,
+                        'char_count': len(page_text),
+                        'word_count': len(page_text.split())
+                    })
+                    
+                    if self.verbose:
+                        print(f"({len(page_text)} chars)")
+            
+            full_text = "".join(text_parts)
+            del text_parts
+            word_count = sum(p['word_count'] for p in page_texts)
             
             # Summary
             if self.verbose:
                 print(f"   ✅ OCR complete")
                 print(f"   📊 Characters: {len(full_text):,}")
-                print(f"   📊 Words: {len(full_text.split()):,}")
+                print(f"   📊 Words: {word_count:,}")
             
             return {
                 'text': full_text,
                 'page_texts': page_texts,
                 'metadata': {
-                    'total_pages': len(images),
-                    'processed_pages': len(images),
+                    'total_pages': page_count,
+                    'processed_pages': pages,
                     'method': 'ocr',
                     'total_characters': len(full_text),
-                    'total_words': len(full_text.split())
+                    'total_words': word_count
                 }
             }
         
@@ -261,23 +421,97 @@ class DocumentProcessor:
                 }
             }
     
+    def merge_results(self, results: List[Dict], join_text: bool = True) -> Dict:
+        """
+        Merge chunked extraction results (see page_numbers) into one result
+        
+        A chunk that failed (metadata 'error') contributes no pages, so its
+        error is carried over to the merged metadata['error'].
+        
+        Args:
+            results: Results from extract_text_from_pdf, in page order
+            join_text: Build the combined 'text'. With False the result has
+                no 'text' key and the chunks may omit theirs too, so the
+                full text is never held in memory (see join_pages)
+        
+        Returns:
+            Combined extraction result dictionary
+        """
+        page_texts = [p for result in results for p in result['page_texts']]
+        full_text = "".join(result['text'] for result in results) if join_text else None
+        total_chars = sum(r['metadata'].get('total_characters', 0) for r in results)
+        total_words = sum(p['word_count'] for p in page_texts)
+        pages_with_text = len([p for p in page_texts if p['char_count'] > 0])
+        errors = [r['metadata']['error'] for r in results if r['metadata'].get('error')]
+        
+        if self.verbose:
+            print(f"   ✅ Extraction complete ({len(results)} chunks)")
+            print(f"   📊 Characters: {total_chars:,}")
+            print(f"   📊 Words: {total_words:,}")
+            print(f"   📊 Pages with text: {pages_with_text}")
+            if errors:
+                print(f"   ⚠️  {len(errors)} of {len(results)} chunks failed - their pages are missing")
+        
+        merged = {
+            'page_texts': page_texts,
+            'metadata': {
+                'total_pages': max((r['metadata'].get('total_pages', 0) for r in results), default=0),
+                'processed_pages': len(page_texts),
+                'method': 'digital',
+                'backend': results[0]['metadata'].get('backend') if results else None,
+                'pages_with_text': pages_with_text,
+                'total_characters': total_chars,
+                'total_words': total_words
+            }
+        }
+        if errors:
+            merged['metadata']['error'] = "; ".join(errors)
+        if join_text:
+            merged = {'text': full_text, **merged}
+        
+        return merged
+    
+    @staticmethod
+    def join_pages(page_texts: List[Dict]) -> str:
+        """
+        Rebuild the full text from page_texts (same layout as result['text'])
+        
+        Lets callers drop result['text'] and reconstruct it only on demand.
+        
+        Args:
+            page_texts: Page dictionaries from extract_text_from_pdf
+        
+        Returns:
+            Concatenated text of all non-empty pages
+        """
+        return "".join(p['text'] + "\n\n" for p in page_texts if p['text'])
+    
     def get_statistics(self, extraction_result: Dict) -> Dict:
         """
         Get detailed statistics from extraction result
         
         Args:
-            extraction_result: Result from extract_text_from_pdf
+            extraction_result: Result from extract_text_from_pdf or
+                merge_results (with or without its 'text')
         
         Returns:
             Statistics dictionary
         """
-        text = extraction_result['text']
         page_texts = extraction_result['page_texts']
+        text = extraction_result.get('text')
+        
+        if text is not None:
+            total_characters = len(text)
+            total_lines = text.count('\n') + 1
+        else:
+            # Same figures as for join_pages(page_texts), without building it
+            total_characters = extraction_result['metadata'].get('total_characters', 0)
+            total_lines = sum(p['text'].count('\n') + 2 for p in page_texts if p['text']) + 1
         
         return {
-            'total_characters': len(text),
-            'total_words': len(text.split()),
-            'total_lines': len(text.split('\n')),
+            'total_characters': total_characters,
+            'total_words': sum(p['word_count'] for p in page_texts),
+            'total_lines': total_lines,
             'total_pages': len(page_texts),
             'pages_with_content': len([p for p in page_texts if p['char_count'] > 0]),
             'avg_chars_per_page': sum(p['char_count'] for p in page_texts) / len(page_texts) if page_texts else 0,
@@ -312,6 +546,8 @@ def test_document_processor():
             print(f"📄 Testing: {os.path.basename(pdf_path)}")
             print(f"{'='*70}")
             
+            print(f"   Digital text layer: {'yes' if processor.probe_digital(pdf_path) else 'no (OCR)'}")
+            
             # Extract
             result = processor.extract_text_from_pdf(pdf_path, max_pages=50)
             
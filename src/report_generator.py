@@ -9,244 +9,165 @@ Features:
 - Compliance summary
 - Detailed findings
 - Recommendations section
+- Document and rule text HTML-escaped
 """
 
 from datetime import datetime
-from typing import Dict, List
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TextIO
 import os
 
 
-class ReportGenerator:
-    """
-    Generates professional HTML compliance reports
-    """
-    
-    def __init__(self, verbose: bool = True):
-        """
-        Initialize Report Generator
-        
-        Args:
-            verbose: Print progress messages
-        """
-        self.verbose = verbose
-        
-        if self.verbose:
-            print("📝 Report Generator initialized")
-    
-    def generate_html_report(
-        self,
-        compliance_results: Dict,
-        extraction_stats: Dict = None,
-        pdf_filename: str = "Unknown",
-        output_path: str = None
-    ) -> str:
-        """
-        Generate complete HTML report
-        
-        Args:
-            compliance_results: Results from ComplianceChecker
-            extraction_stats: Stats from DocumentProcessor
-            pdf_filename: Name of processed PDF
-            output_path: Where to save report
-        
-        Returns:
-            Path to generated report
-        """
-        if self.verbose:
-            print(f"\n{'='*70}")
-            print("📝 Generating HTML Report")
-            print(f"{'='*70}")
-        
-        # Default output path
-        if output_path is None:
-            output_path = "data/outputs/compliance_report.html"
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Generate HTML
-        html = self._build_html(
-            compliance_results,
-            extraction_stats,
-            pdf_filename
-        )
-        
-        # Save file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        if self.verbose:
-            print(f"   ✅ Report generated: {output_path}")
-            print(f"   📄 File size: {len(html):,} bytes")
-        
-        return output_path
-    
-    def _build_html(
-        self,
-        results: Dict,
-        stats: Dict,
-        pdf_filename: str
-    ) -> str:
-        """
-        Build complete HTML content
-        """
-        summary = results['summary']
-        detailed = results['detailed_results']
-        
-        # Calculate percentages
-        total = summary['total_checks']
-        compliant_pct = (summary['compliant'] / total * 100) if total else 0
-        non_compliant_pct = (summary['non_compliant'] / total * 100) if total else 0
-        missing_pct = (summary['missing'] / total * 100) if total else 0
-        
-        # Build HTML
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Financial Compliance Report - {pdf_filename}</title>
-    <style>
-        * {{
+# CSS class of each check status (see .check-item.* in _REPORT_CSS)
+_STATUS_CLASS = {
+    'COMPLIANT': 'compliant',
+    'NON-COMPLIANT': 'non_compliant',
+    'MISSING': 'missing'
+}
+
+# Report stylesheet, written verbatim into every report
+_REPORT_CSS = """\
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: #f5f7fa;
             color: #2d3748;
             line-height: 1.6;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 32px;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        .header p {{
+        .header p {
             opacity: 0.9;
             font-size: 16px;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .section {{
+        .section {
             margin-bottom: 40px;
-        }}
+        }
         
-        .section h2 {{
+        .section h2 {
             font-size: 24px;
             margin-bottom: 20px;
             color: #1a202c;
             border-bottom: 3px solid #667eea;
             padding-bottom: 10px;
-        }}
+        }
         
-        .metrics {{
+        .metrics {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .metric-card {{
+        .metric-card {
             background: #f7fafc;
             padding: 25px;
             border-radius: 10px;
             text-align: center;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .metric-card.compliant {{
+        .metric-card.compliant {
             border-left-color: #48bb78;
-        }}
+        }
         
-        .metric-card.non-compliant {{
+        .metric-card.non-compliant {
             border-left-color: #f56565;
-        }}
+        }
         
-        .metric-card.missing {{
+        .metric-card.missing {
             border-left-color: #ed8936;
-        }}
+        }
         
-        .metric-value {{
+        .metric-value {
             font-size: 42px;
             font-weight: 700;
             color: #667eea;
             margin-bottom: 5px;
-        }}
+        }
         
-        .metric-card.compliant .metric-value {{
+        .metric-card.compliant .metric-value {
             color: #48bb78;
-        }}
+        }
         
-        .metric-card.non-compliant .metric-value {{
+        .metric-card.non-compliant .metric-value {
             color: #f56565;
-        }}
+        }
         
-        .metric-card.missing .metric-value {{
+        .metric-card.missing .metric-value {
             color: #ed8936;
-        }}
+        }
         
-        .metric-label {{
+        .metric-label {
             color: #718096;
             font-size: 14px;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .score-card {{
+        .score-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             border-radius: 10px;
             text-align: center;
             margin-bottom: 30px;
-        }}
+        }
         
-        .score-value {{
+        .score-value {
             font-size: 64px;
             font-weight: 700;
             margin-bottom: 10px;
-        }}
+        }
         
-        .score-label {{
+        .score-label {
             font-size: 18px;
             opacity: 0.9;
-        }}
+        }
         
-        .rating {{
+        .rating {
             display: inline-block;
             padding: 8px 16px;
             border-radius: 20px;
             background: rgba(255, 255, 255, 0.2);
             margin-top: 10px;
             font-weight: 600;
-        }}
+        }
         
-        .check-item {{
+        .check-item {
             background: white;
             border: 1px solid #e2e8f0;
             border-left: 4px solid #cbd5e0;
@@ -254,52 +175,52 @@ class ReportGenerator:
             margin-bottom: 15px;
             border-radius: 8px;
             transition: all 0.2s;
-        }}
+        }
         
-        .check-item:hover {{
+        .check-item:hover {
             box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
             transform: translateY(-2px);
-        }}
+        }
         
-        .check-item.compliant {{
+        .check-item.compliant {
             border-left-color: #48bb78;
             background: #f0fff4;
-        }}
+        }
         
-        .check-item.non_compliant {{
+        .check-item.non_compliant {
             border-left-color: #f56565;
             background: #fff5f5;
-        }}
+        }
         
-        .check-item.missing {{
+        .check-item.missing {
             border-left-color: #ed8936;
             background: #fffaf0;
-        }}
+        }
         
-        .check-header {{
+        .check-header {
             display: flex;
             align-items: center;
             margin-bottom: 10px;
-        }}
+        }
         
-        .check-status {{
+        .check-status {
             font-size: 24px;
             margin-right: 12px;
-        }}
+        }
         
-        .check-title {{
+        .check-title {
             font-weight: 600;
             font-size: 16px;
             color: #2d3748;
-        }}
+        }
         
-        .check-details {{
+        .check-details {
             margin-left: 36px;
             color: #718096;
             font-size: 14px;
-        }}
+        }
         
-        .evidence {{
+        .evidence {
             background: #edf2f7;
             padding: 10px;
             border-radius: 5px;
@@ -307,50 +228,50 @@ class ReportGenerator:
             font-family: 'Courier New', monospace;
             font-size: 13px;
             color: #4a5568;
-        }}
+        }
         
-        .standard-group {{
+        .standard-group {
             margin-bottom: 30px;
-        }}
+        }
         
-        .standard-header {{
+        .standard-header {
             background: #edf2f7;
             padding: 15px 20px;
             border-radius: 8px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .standard-title {{
+        .standard-title {
             font-size: 18px;
             font-weight: 600;
             color: #2d3748;
-        }}
+        }
         
-        .standard-subtitle {{
+        .standard-subtitle {
             color: #718096;
             font-size: 14px;
             margin-top: 4px;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: #f7fafc;
             padding: 30px;
             text-align: center;
             color: #718096;
             font-size: 14px;
             border-top: 1px solid #e2e8f0;
-        }}
+        }
         
-        .progress-bar {{
+        .progress-bar {
             width: 100%;
             height: 30px;
             background: #e2e8f0;
             border-radius: 15px;
             overflow: hidden;
             margin: 20px 0;
-        }}
+        }
         
-        .progress-fill {{
+        .progress-fill {
             height: 100%;
             background: linear-gradient(90deg, #48bb78 0%, #38a169 100%);
             display: flex;
@@ -360,15 +281,193 @@ class ReportGenerator:
             font-weight: 600;
             font-size: 14px;
             transition: width 1s ease;
-        }}
-    </style>
+        }
+"""
+
+class ReportGenerator:
+    """
+    Generates professional HTML compliance reports
+    """
+    
+    def __init__(self, verbose: bool = True):
+        """
+        Initialize Report Generator
+        
+        Args:
+            verbose: Print progress messages
+        """
+        self.verbose = verbose
+        # Output directories already created by this generator
+        self._ensured_dirs = set()
+        
+        if self.verbose:
+            print("📝 Report Generator initialized")
+    
+    def generate_html_report(
+        self,
+        compliance_results: Dict,
+        extraction_stats: Dict = None,
+        pdf_filename: str = "Unknown",
+        output_path: str = None
+    ) -> str:
+        """
+        Generate complete HTML report
+        
+        Args:
+            compliance_results: Results from ComplianceChecker
+            extraction_stats: Stats from DocumentProcessor
+            pdf_filename: Name of processed PDF
+            output_path: Where to save report
+        
+        Returns:
+            Path to generated report
+        """
+        if self.verbose:
+            print(f"\n{'='*70}")
+            print("📝 Generating HTML Report")
+            print(f"{'='*70}")
+        
+        # Default output path
+        if output_path is None:
+            output_path = "data/outputs/compliance_report.html"
+        
+        # Ensure directory exists
+        self._ensure_dir(os.path.dirname(output_path))
+        
+        return self._save_report(
+            output_path,
+            compliance_results,
+            extraction_stats,
+            pdf_filename
+        )
+    
+    def generate_many(
+        self,
+        reports: Iterable[Dict],
+        output_dir: str = "data/outputs"
+    ) -> List[str]:
+        """
+        Generate one HTML report per analyzed document
+        
+        The output directory is created once for the whole batch and the
+        static stylesheet is shared by every report.
+        
+        Args:
+            reports: Dicts of generate_html_report arguments
+                (compliance_results, extraction_stats, pdf_filename);
+                without 'output_path' a report is saved as
+                compliance_report_<pdf name>.html in output_dir
+            output_dir: Directory for the reports
+        
+        Returns:
+            Paths to the generated reports, in input order
+        """
+        if self.verbose:
+            print(f"\n{'='*70}")
+            print("📝 Generating HTML Reports")
+            print(f"{'='*70}")
+        
+        self._ensure_dir(output_dir)
+        paths = []
+        
+        for report in reports:
+            report = dict(report)
+            output_path = report.pop('output_path', None)
+            if output_path is None:
+                stem = Path(report.get('pdf_filename', 'Unknown')).stem
+                output_path = os.path.join(output_dir, f"compliance_report_{stem}.html")
+            else:
+                self._ensure_dir(os.path.dirname(output_path))
+            
+            paths.append(self._save_report(
+                output_path,
+                report['compliance_results'],
+                report.get('extraction_stats'),
+                report.get('pdf_filename', 'Unknown')
+            ))
+        
+        return paths
+    
+    def _ensure_dir(self, directory: str):
+        """Create an output directory unless this generator already did"""
+        directory = directory or '.'
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
+    
+    def _save_report(
+        self,
+        output_path: str,
+        compliance_results: Dict,
+        extraction_stats: Optional[Dict],
+        pdf_filename: str
+    ) -> str:
+        """Write one report to output_path (its directory must exist)"""
+        # Generate HTML straight into the file (the report is never held
+        # in memory as one string)
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            self._write_html(
+                f,
+                compliance_results,
+                extraction_stats,
+                pdf_filename
+            )
+        
+        if self.verbose:
+            print(f"   ✅ Report generated: {output_path}")
+            print(f"   📄 File size: {os.path.getsize(output_path):,} bytes")
+        
+        return output_path
+    
+    def _write_html(
+        self,
+        out: TextIO,
+        results: Dict,
+        stats: Dict,
+        pdf_filename: str
+    ):
+        """
+        Write complete HTML content to out, section by section
+        """
+        summary = results['summary']
+        detailed = results['detailed_results']
+        
+        # Calculate percentages
+        total = summary['total_checks']
+        # One branch for all three; count * 100 / total is a single
+        # correctly rounded division for integer counts
+        if total:
+            compliant_pct = summary['compliant'] * 100 / total
+            non_compliant_pct = summary['non_compliant'] * 100 / total
+            missing_pct = summary['missing'] * 100 / total
+        else:
+            compliant_pct = non_compliant_pct = missing_pct = 0
+        
+        # One timestamp for both places it is shown
+        now = datetime.now()
+        generated_on = now.strftime('%B %d, %Y at %H:%M')
+        analysis_date = now.strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Page head with the static stylesheet
+        out.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Financial Compliance Report - {escape(pdf_filename)}</title>
+    <style>
+""")
+        out.write(_REPORT_CSS)
+        
+        # Header, summary and start of the detailed results
+        out.write(f"""    </style>
 </head>
 <body>
     <div class="container">
         <!-- Header -->
         <div class="header">
             <h1>📊 Financial Compliance Report</h1>
-            <p>IndiaAI Challenge 2026 • Generated on {datetime.now().strftime('%B %d, %Y at %H:%M')}</p>
+            <p>IndiaAI Challenge 2026 • Generated on {generated_on}</p>
         </div>
         
         <!-- Content -->
@@ -376,8 +475,8 @@ class ReportGenerator:
             <!-- File Info -->
             <div class="section">
                 <h2>📄 Document Information</h2>
-                <p><strong>File:</strong> {pdf_filename}</p>
-                <p><strong>Analysis Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                <p><strong>File:</strong> {escape(pdf_filename)}</p>
+                <p><strong>Analysis Date:</strong> {analysis_date}</p>
                 {self._generate_extraction_stats_html(stats)}
             </div>
             
@@ -423,7 +522,12 @@ class ReportGenerator:
             <!-- Detailed Results -->
             <div class="section">
                 <h2>🔍 Detailed Compliance Results</h2>
-                {self._generate_detailed_results_html(detailed)}
+                """)
+        
+        self._write_detailed_results_html(out, detailed)
+        
+        # Footer
+        out.write("""
             </div>
         </div>
         
@@ -437,9 +541,7 @@ class ReportGenerator:
         </div>
     </div>
 </body>
-</html>"""
-        
-        return html
+</html>""")
     
     def _generate_extraction_stats_html(self, stats: Dict) -> str:
         """Generate extraction statistics HTML"""
@@ -447,63 +549,69 @@ class ReportGenerator:
             return ""
         
         return f"""
-                <p><strong>Extraction Method:</strong> {stats.get('method', 'N/A').upper()}</p>
+                <p><strong>Extraction Method:</strong> {escape(stats.get('method', 'N/A').upper())}</p>
                 <p><strong>Pages Analyzed:</strong> {stats.get('total_pages', 'N/A')}</p>
                 <p><strong>Characters Extracted:</strong> {stats.get('total_characters', 0):,}</p>
                 <p><strong>Words Extracted:</strong> {stats.get('total_words', 0):,}</p>
         """
     
-    def _generate_detailed_results_html(self, detailed: List[Dict]) -> str:
-        """Generate detailed results HTML"""
-        html_parts = []
-        
-        for standard in detailed:
-            standard_html = f"""
+    def _write_detailed_results_html(
+        self,
+        out: TextIO,
+        detailed: List[Dict]
+    ):
+        """Write detailed results HTML, one standard at a time"""
+        write = out.write
+        
+        for i, standard in enumerate(detailed):
+            # Fragments go straight to out; no per-standard string is built
+            if i:
+                write("\n")
+            write(f"""
                 <div class="standard-group">
                     <div class="standard-header">
-                        <div class="standard-title">{standard['standard_id']}: {standard['standard_name']}</div>
+                        <div class="standard-title">{escape(standard['standard_id'])}: {escape(standard['standard_name'])}</div>
                         <div class="standard-subtitle">
-                            Category: {standard.get('category', 'N/A').replace('_', ' ').title()} • 
-                            Priority: {standard.get('priority', 'MEDIUM')} • 
+                            Category: {escape(standard.get('category', 'N/A').replace('_', ' ').title())} • 
+                            Priority: {escape(standard.get('priority', 'MEDIUM'))} • 
                             Passed: {standard.get('compliant_count', 0)}/{standard.get('total_count', 0)} checks
                         </div>
                     </div>
-            """
+            """)
             
             # Add checks
             for check in standard['checks']:
-                status_class = check['status'].lower().replace(' ', '_').replace('-', '_')
+                status_class = _STATUS_CLASS.get(check['status'])
+                if status_class is None:
+                    status_class = escape(check['status'].lower().replace(' ', '_').replace('-', '_'))
                 
-                check_html = f"""
+                write(f"""
                     <div class="check-item {status_class}">
                         <div class="check-header">
                             <span class="check-status">{check['symbol']}</span>
-                            <span class="check-title">{check['requirement']}</span>
+                            <span class="check-title">{escape(check['requirement'])}</span>
                         </div>
                         <div class="check-details">
-                            <div><strong>Status:</strong> {check['status']}</div>
-                            <div><strong>Check ID:</strong> {check['check_id']}</div>
+                            <div><strong>Status:</strong> {escape(check['status'])}</div>
+                            <div><strong>Check ID:</strong> {escape(check['check_id'])}</div>
                             <div><strong>Mandatory:</strong> {'Yes' if check.get('mandatory', True) else 'No'}</div>
-                """
+                """)
                 
-                if check.get('evidence'):
-                    check_html += f"""
+                evidence = check.get('evidence')
+                if evidence:
+                    evidence_preview = evidence[:150] + '...' if len(evidence) > 150 else evidence
+                    write(f"""
                             <div class="evidence">
-                                💡 Evidence: "{check['evidence'][:150]}{'...' if len(check['evidence']) > 150 else ''}"
+                                💡 Evidence: "{escape(evidence_preview)}"
                             </div>
-                    """
+                    """)
                 
-                check_html += """
+                write("""
                         </div>
                     </div>
-                """
-                
-                standard_html += check_html
+                """)
             
-            standard_html += "</div>"
-            html_parts.append(standard_html)
-        
-        return "\n".join(html_parts)
+            write("</div>")
     
     def _get_rating_label(self, score: float) -> str:
         """Get rating label based on score"""
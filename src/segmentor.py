@@ -11,7 +11,8 @@ Features:
 """
 
 import re
-from typing import Dict, List, Optional
+from array import array
+from typing import Dict, List, Optional, Pattern
 import os
 
 
@@ -100,19 +101,61 @@ class DocumentSegmenter:
             }
         }
         
+        # One compiled alternation per section, built once. Pages are
+        # lowercased before matching, so no IGNORECASE is needed
+        self._section_regexes = {
+            name: re.compile('|'.join(f'(?:{p})' for p in info['patterns']))
+            for name, info in self.section_patterns.items()
+        }
+        # Plain words each pattern needs, checked with str `in` before
+        # running the regex (most pages match no section at all)
+        self._section_literals = {
+            name: tuple(self._required_literals(p) for p in info['patterns'])
+            for name, info in self.section_patterns.items()
+        }
+        
         if self.verbose:
             print("🔍 Document Segmenter initialized")
             print(f"   📋 Tracking {len(self.section_patterns)} section types")
     
+    @staticmethod
+    def _required_literals(pattern: str) -> tuple:
+        """
+        Get the plain words every match of a section pattern contains
+        
+        Optional or grouped parts, character classes and quantified
+        characters are dropped, so the result only ever under-approximates
+        the pattern.
+        
+        Args:
+            pattern: Section regex (lowercase)
+        
+        Returns:
+            Tuple of words (empty = no prefilter possible)
+        """
+        if '|' in pattern:
+            return ()
+        
+        pattern = re.sub(r"\([^()]*\)\S?|\[[^\]]*\]\S?", " ", pattern)
+        pattern = re.sub(r"\\?.(?:[?*]|\{[^}]*\})", " ", pattern)
+        pattern = re.sub(r"\\.", " ", pattern)
+        
+        return tuple(re.findall(r"[a-z&]+", pattern))
+    
     def segment_document(
         self, 
-        page_texts: List[Dict]
+        page_texts: List[Dict],
+        anchored: bool = False
     ) -> Dict:
         """
         Segment document into sections
         
         Args:
             page_texts: List of page dictionaries from DocumentProcessor
+            anchored: Treat each section as the contiguous page range from
+                its first title match up to the next section's title
+                (disjoint sections, see _anchor_sections) instead of every
+                page mentioning it
         
         Returns:
             Sections dictionary
@@ -125,15 +168,23 @@ class DocumentSegmenter:
         
         sections = {}
         
-        # Find each section
-        for section_name, section_info in self.section_patterns.items():
-            section_result = self._find_section(
-                page_texts,
-                section_info['patterns'],
-                section_name
-            )
-            
-            sections[section_name] = section_result
+        # Lowercase each page once, shared by all section types
+        pages_lower = [page_data.get('text', '').lower() for page_data in page_texts]
+        
+        if anchored:
+            sections = self._anchor_sections(page_texts, pages_lower)
+        else:
+            # Find each section
+            for section_name, section_info in self.section_patterns.items():
+                section_result = self._find_section(
+                    page_texts,
+                    pages_lower,
+                    self._section_regexes[section_name],
+                    section_name,
+                    self._section_literals[section_name]
+                )
+                
+                sections[section_name] = section_result
         
         # Summary
         if self.verbose:
@@ -142,83 +193,178 @@ class DocumentSegmenter:
             print(f"\n   ✅ Segmentation complete")
             print(f"   📋 Found {len(found_sections)} sections:")
             for section in found_sections:
-                pages = sections[section]['pages']
-                if pages:
-                    page_range = f"{min(pages)}-{max(pages)}" if len(pages) > 1 else str(pages[0])
-                    print(f"      • {section}: pages {page_range}")
+                # Pages are collected in order, so start/end are the range
+                start, end = sections[section]['start_page'], sections[section]['end_page']
+                page_range = f"{start}-{end}" if start != end else str(start)
+                print(f"      • {section}: pages {page_range}")
+        
+        return sections
+    
+    def _anchor_sections(
+        self,
+        page_texts: List[Dict],
+        pages_lower: List[str]
+    ) -> Dict:
+        """
+        Split the document into disjoint, contiguous sections
+        
+        A section starts on the first page matching its patterns and runs
+        until another section starts. Only sections not found yet are
+        searched for, highest priority first, so the scan shrinks as
+        sections are located and stops once all of them are.
+        
+        Args:
+            page_texts: Page dictionaries
+            pages_lower: Lowercase text of each page
+        
+        Returns:
+            Sections dictionary (same entries as _find_section)
+        """
+        sections = {
+            name: {
+                'found': False,
+                'pages': array('i'),
+                'start_page': None,
+                'end_page': None,
+                'total_chars': 0
+            }
+            for name in self.section_patterns
+        }
+        pending = sorted(
+            self.section_patterns,
+            key=lambda name: -self.section_patterns[name]['priority']
+        )
+        current = None
+        
+        for page_data, text_lower in zip(page_texts, pages_lower):
+            page_num = page_data['page_num']
+            
+            for name in pending:
+                if any(
+                    all(word in text_lower for word in words)
+                    for words in self._section_literals[name]
+                ) and self._section_regexes[name].search(text_lower):
+                    pending.remove(name)
+                    current = sections[name]
+                    current['found'] = True
+                    current['start_page'] = page_num
+                    
+                    if self.verbose:
+                        print(f"   ✅ Found {name} on page {page_num}")
+                    break
+            
+            if current is not None:
+                current['pages'].append(page_num)
+                current['total_chars'] += len(page_data.get('text', ''))
+                current['end_page'] = page_num
         
         return sections
     
     def _find_section(
         self, 
         page_texts: List[Dict],
-        patterns: List[str],
-        section_name: str
+        pages_lower: List[str],
+        pattern: Pattern,
+        section_name: str,
+        literals: tuple = ((),)
     ) -> Dict:
         """
         Find specific section in document
         
         Args:
             page_texts: Page dictionaries
-            patterns: Regex patterns to search
+            pages_lower: Lowercase text of each page
+            pattern: Compiled alternation of the section's patterns
             section_name: Name of section
+            literals: Per pattern, words that must all be on the page for
+                it to match (see _required_literals)
         
         Returns:
-            Section info dictionary
+            Section info dictionary (page references only - see
+            get_section_text)
         """
         result = {
             'found': False,
-            'pages': [],
-            'text': '',
+            'pages': array('i'),  # page numbers, packed C ints
             'start_page': None,
             'end_page': None,
             'total_chars': 0
         }
         
-        for page_data in page_texts:
+        for page_data, text_lower in zip(page_texts, pages_lower):
             page_num = page_data['page_num']
-            text = page_data.get('text', '')
-            text_lower = text.lower()
             
-            # Check if any pattern matches
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    # Found the section
-                    if not result['found']:
-                        result['found'] = True
-                        result['start_page'] = page_num
-                        
-                        if self.verbose:
-                            print(f"   ✅ Found {section_name} on page {page_num}")
+            # Cheap word prefilter, then check if any pattern matches
+            if not any(all(word in text_lower for word in words) for words in literals):
+                continue
+            
+            if pattern.search(text_lower):
+                # Found the section
+                if not result['found']:
+                    result['found'] = True
+                    result['start_page'] = page_num
                     
-                    result['pages'].append(page_num)
-                    result['text'] += text + "\n"
-                    result['total_chars'] += len(text)
-                    result['end_page'] = page_num
-                    break
+                    if self.verbose:
+                        print(f"   ✅ Found {section_name} on page {page_num}")
+                
+                result['pages'].append(page_num)
+                result['total_chars'] += len(page_data.get('text', ''))
+                result['end_page'] = page_num
         
         return result
     
+    def get_section_text(
+        self,
+        sections: Dict,
+        section_name: str,
+        page_texts: List[Dict]
+    ) -> str:
+        """
+        Get the text of a section, joining its pages on first use
+        
+        Sections only store page numbers; the joined text is cached in
+        sections[section_name]['text'] once requested.
+        
+        Args:
+            sections: Sections dictionary from segment_document
+            section_name: Name of section
+            page_texts: The page dictionaries that were segmented
+        
+        Returns:
+            Text of the section's pages, each followed by a newline
+        """
+        section = sections[section_name]
+        
+        if 'text' not in section:
+            pages = set(section['pages'])
+            section['text'] = "".join(
+                p.get('text', '') + "\n" for p in page_texts if p['page_num'] in pages
+            )
+        
+        return section['text']
+    
     def build_document_structure(
         self, 
-        page_texts: List[Dict]
+        page_texts: List[Dict],
+        anchored: bool = False
     ) -> Dict:
         """
         Build complete document structure
         
         Args:
             page_texts: Page dictionaries from DocumentProcessor
+            anchored: Disjoint page-range sections (see segment_document)
         
         Returns:
             Document structure dictionary
         """
-        sections = self.segment_document(page_texts)
+        sections = self.segment_document(page_texts, anchored)
         
         structure = {
             'total_pages': len(page_texts),
             'sections': sections,
             'metadata': {
-                'segmentation_method': 'regex_pattern_matching',
+                'segmentation_method': 'anchored_page_ranges' if anchored else 'regex_pattern_matching',
                 'sections_found': len([s for s in sections.values() if s['found']]),
                 'total_sections_tracked': len(self.section_patterns)
             }
@@ -4,7 +4,7 @@ Author: Nawddeep
 Date: February 2026
 
 Features:
-- Extract tables using pdfplumber & camelot
+- Extract tables using pdfplumber or PyMuPDF
 - Identify table types (Balance Sheet, P&L, Cash Flow)
 - Convert to pandas DataFrames
 - Handle merged cells and complex layouts
@@ -12,63 +12,142 @@ Features:
 
 import pdfplumber
 import pandas as pd
-from typing import List, Dict, Optional
+from collections import Counter
+from itertools import chain, islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
 import re
 import os
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional dependency (normally installed with pdfplumber)
+    pdfium = None
+
+try:
+    import pymupdf
+except ImportError:  # optional dependency
+    pymupdf = None
+
+try:
+    import xlsxwriter
+except ImportError:  # optional dependency
+    xlsxwriter = None
+
+try:
+    from .utils import open_pymupdf, pdfium_input, pdfium_page_text
+except ImportError:  # run as a script (python src/table_extractor.py)
+    from utils import open_pymupdf, pdfium_input, pdfium_page_text
+
 
 class TableExtractor:
     """
     Extracts and identifies financial tables from PDFs
     """
     
-    def __init__(self, verbose: bool = True):
+    # Table type patterns (lowercase - the classifier lowercases its input)
+    table_patterns = {
+        'balance_sheet': [
+            r'balance\s+sheet',
+            r'statement\s+of\s+financial\s+position',
+            r'assets.*liabilities'
+        ],
+        'profit_loss': [
+            r'profit.*loss',
+            r'statement\s+of\s+profit',
+            r'income\s+statement',
+            r'revenue.*expenses'
+        ],
+        'cash_flow': [
+            r'cash\s+flow',
+            r'statement\s+of\s+cash\s+flows',
+            r'operating.*investing.*financing'
+        ],
+        'equity': [
+            r'changes\s+in\s+equity',
+            r'statement\s+of\s+changes'
+        ]
+    }
+    
+    # One alternation per type, compiled once at import and shared by all
+    # instances. No IGNORECASE flag, as the patterns and input are lowercase
+    _compiled_patterns = {
+        table_type: re.compile("|".join(f"(?:{p})" for p in patterns))
+        for table_type, patterns in table_patterns.items()
+    }
+    
+    # pdfplumber's default table finder settings, pinned so upgrades
+    # can't change the detected tables
+    table_settings = {
+        "vertical_strategy": "lines",
+        "horizontal_strategy": "lines",
+        "snap_tolerance": 3,
+        "join_tolerance": 3
+    }
+    
+    # Classification only reads the top of a table and of its page
+    classify_rows = 5
+    classify_page_chars = 2000
+    
+    def __init__(
+        self, 
+        verbose: bool = True, 
+        backend: str = 'pdfplumber',
+        keep_other: bool = True,
+        use_pdfium: bool = False
+    ):
         """
         Initialize Table Extractor
         
         Args:
             verbose: Print progress messages
+            backend: Table finder - 'pdfplumber' or 'pymupdf' (MuPDF's C
+                parser, faster; detected tables can differ slightly)
+            keep_other: Also return tables that match no financial type
+                (False skips their DataFrame conversion)
+            use_pdfium: With the pdfplumber backend, read page text (for
+                classification and snippets) with pypdfium2 instead of
+                pdfplumber's layout pass - faster, but text order
+                differs and can change a table's type
         """
         self.verbose = verbose
+        self.keep_other = keep_other
+        self.table_backends = ['pdfplumber', 'pymupdf']
         
-        # Table type patterns
-        self.table_patterns = {
-            'balance_sheet': [
-                r'balance\s+sheet',
-                r'statement\s+of\s+financial\s+position',
-                r'assets.*liabilities'
-            ],
-            'profit_loss': [
-                r'profit.*loss',
-                r'statement\s+of\s+profit',
-                r'income\s+statement',
-                r'revenue.*expenses'
-            ],
-            'cash_flow': [
-                r'cash\s+flow',
-                r'statement\s+of\s+cash\s+flows',
-                r'operating.*investing.*financing'
-            ],
-            'equity': [
-                r'changes\s+in\s+equity',
-                r'statement\s+of\s+changes'
-            ]
-        }
+        if backend not in self.table_backends:
+            raise ValueError(f"Unsupported backend. Use: {self.table_backends}")
+        
+        if backend == 'pymupdf' and pymupdf is None:
+            if self.verbose:
+                print("   ⚠️  pymupdf not installed - using pdfplumber")
+            backend = 'pdfplumber'
+        
+        self.backend = backend
+        
+        if use_pdfium and pdfium is None:
+            if self.verbose:
+                print("   ⚠️  pypdfium2 not installed - using pdfplumber text")
+            use_pdfium = False
+        
+        self.use_pdfium = use_pdfium
         
         if self.verbose:
             print("📊 Table Extractor initialized")
     
     def extract_all_tables(
         self, 
-        pdf_path: str, 
-        max_pages: int = 200
+        pdf_path: Union[str, BinaryIO], 
+        max_pages: int = 200,
+        page_numbers: Optional[List[int]] = None
     ) -> List[Dict]:
         """
         Extract all tables from PDF
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_path: Path to PDF file, or an open binary buffer such as
+                utils.map_pdf()
             max_pages: Maximum pages to process
+            page_numbers: Zero-based page indices to process instead of
+                the first max_pages (used for chunked/parallel extraction)
         
         Returns:
             List of table dictionaries
@@ -81,77 +160,186 @@ class TableExtractor:
         all_tables = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-                pages_to_check = min(max_pages, total_pages)
+            for table_info in self.iter_tables(pdf_path, max_pages, page_numbers):
+                all_tables.append(table_info)
+            
+            if self.verbose:
+                print(f"\n   ✅ Extraction complete")
+                self.print_table_summary(all_tables)
+        
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+        
+        return all_tables
+    
+    def iter_tables(
+        self, 
+        pdf_path: Union[str, BinaryIO], 
+        max_pages: int = 200,
+        page_numbers: Optional[List[int]] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield tables page by page as they are extracted
+        
+        Each page's parsed layout is released once its tables are read,
+        so memory does not grow with the number of pages processed.
+        
+        Args:
+            pdf_path: Path to PDF file, or an open binary buffer
+            max_pages: Maximum pages to process
+            page_numbers: Zero-based page indices to process instead of
+                the first max_pages
+        
+        Yields:
+            Table dictionaries (see extract_all_tables)
+        """
+        text_pdf = None
+        
+        if self.backend == 'pymupdf':
+            pdf = open_pymupdf(pdf_path)
+            read_page = lambda i: self._pymupdf_page(pdf, i)
+            total_pages = len(pdf)
+        else:
+            pdf = pdfplumber.open(pdf_path)
+            if self.use_pdfium:
+                text_pdf = pdfium.PdfDocument(pdfium_input(pdf_path))
+            read_page = lambda i: self._pdfplumber_page(pdf, i, text_pdf)
+            total_pages = len(pdf.pages)
+        
+        try:
+            if page_numbers is not None:
+                page_indices = [i for i in page_numbers if 0 <= i < total_pages]
+            else:
+                page_indices = range(min(max_pages, total_pages))
+            pages_to_check = len(page_indices)
+            
+            if self.verbose:
+                print(f"   📄 Total pages: {total_pages}")
+                print(f"   🔢 Processing: {pages_to_check} pages")
+            
+            # Extract from each page
+            for done, i in enumerate(page_indices, 1):
+                page_text, tables = read_page(i)
                 
-                if self.verbose:
-                    print(f"   📄 Total pages: {total_pages}")
-                    print(f"   🔢 Processing: {pages_to_check} pages")
+                yield from self._page_tables(page_text, tables, i)
                 
-                # Extract from each page
-                for i in range(pages_to_check):
-                    page = pdf.pages[i]
-                    page_text = page.extract_text() or ""
-                    
-                    # Try to extract tables
-                    tables = page.extract_tables()
+                # Progress indicator
+                if self.verbose and done % 50 == 0:
+                    print(f"   ⏳ Progress: {done}/{pages_to_check} pages")
+        finally:
+            pdf.close()
+            if text_pdf is not None:
+                text_pdf.close()
+    
+    def _pdfplumber_page(self, pdf, page_index: int, text_pdf=None):
+        """
+        Read one page's text and raw tables with pdfplumber
+        
+        Args:
+            pdf: Open pdfplumber PDF
+            page_index: Zero-based page index
+            text_pdf: Open pdfium.PdfDocument to read the text from instead
+        
+        Returns:
+            tuple: (page text, list of 2D cell arrays)
+        """
+        page = pdf.pages[page_index]
+        try:
+            if text_pdf is not None:
+                page_text = pdfium_page_text(text_pdf, page_index)
+            else:
+                page_text = page.extract_text() or ""
+            
+            return page_text, page.extract_tables(self.table_settings)
+        finally:
+            # pdf.pages keeps every Page; drop its cached chars, layout
+            # objects and text map so they don't pile up
+            page.close()
+    
+    def _pymupdf_page(self, pdf, page_index: int):
+        """
+        Read one page's text and raw tables with PyMuPDF
+        
+        Args:
+            pdf: Open pymupdf.Document
+            page_index: Zero-based page index
+        
+        Returns:
+            tuple: (page text, list of 2D cell arrays)
+        """
+        page = pdf.load_page(page_index)
+        tables = [table.extract() for table in page.find_tables().tables]
+        return page.get_text("text").strip(), tables
+    
+    def _page_tables(
+        self, 
+        page_text: str, 
+        tables: List[List[List]], 
+        page_index: int
+    ) -> Iterator[Dict]:
+        """
+        Convert and classify the raw tables of one page
+        
+        Args:
+            page_text: Text of the page
+            tables: 2D cell arrays found on the page
+            page_index: Zero-based page index
+        
+        Yields:
+            Table dictionaries
+        """
+        if not tables:
+            return
+        
+        if self.verbose:
+            print(f"   📄 Page {page_index+1}: Found {len(tables)} table(s)")
+        
+        # Shared by every table on the page
+        page_text_lower = page_text[:self.classify_page_chars].lower()
+        
+        for table_idx, table in enumerate(tables):
+            if table and len(table) > 1:  # At least 2 rows
+                try:
+                    # Identify table type on the raw cells, so tables that
+                    # are not kept never become DataFrames
+                    table_type = self._classify_raw(table, page_text_lower)
                     
-                    if tables:
-                        if self.verbose and len(tables) > 0:
-                            print(f"   📄 Page {i+1}: Found {len(tables)} table(s)")
-                        
-                        for table_idx, table in enumerate(tables):
-                            if table and len(table) > 1:  # At least 2 rows
-                                # Convert to DataFrame
-                                try:
-                                    df = self._table_to_dataframe(table)
-                                    
-                                    # Identify table type
-                                    table_type = self._identify_table_type(
-                                        df, 
-                                        page_text
-                                    )
-                                    
-                                    # Store table info
-                                    table_info = {
-                                        'page': i + 1,
-                                        'table_index': table_idx,
-                                        'type': table_type,
-                                        'data': df,
-                                        'rows': len(df),
-                                        'columns': len(df.columns),
-                                        'page_text_snippet': page_text[:200]
-                                    }
-                                    
-                                    all_tables.append(table_info)
-                                
-                                except Exception as e:
-                                    if self.verbose:
-                                        print(f"      ⚠️  Error processing table: {e}")
+                    if table_type == 'other' and not self.keep_other:
+                        continue
                     
-                    # Progress indicator
-                    if self.verbose and (i + 1) % 50 == 0:
-                        print(f"   ⏳ Progress: {i + 1}/{pages_to_check} pages")
+                    # Convert to DataFrame
+                    df = self._table_to_dataframe(table)
+                except Exception as e:
+                    if self.verbose:
+                        print(f"      ⚠️  Error processing table: {e}")
+                    continue
                 
-                if self.verbose:
-                    print(f"\n   ✅ Extraction complete")
-                    print(f"   📊 Total tables found: {len(all_tables)}")
-                    
-                    # Summary by type
-                    type_counts = {}
-                    for table in all_tables:
-                        t_type = table['type']
-                        type_counts[t_type] = type_counts.get(t_type, 0) + 1
-                    
-                    print(f"\n   📋 Tables by type:")
-                    for t_type, count in type_counts.items():
-                        print(f"      {t_type}: {count}")
+                # Store table info
+                yield {
+                    'page': page_index + 1,
+                    'table_index': table_idx,
+                    'type': table_type,
+                    'data': df,
+                    'rows': len(df),
+                    'columns': len(df.columns),
+                    'page_text_snippet': page_text[:200]
+                }
+    
+    def print_table_summary(self, tables: List[Dict]):
+        """
+        Print table count summary by type
         
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
+        Args:
+            tables: List of table dictionaries
+        """
+        print(f"   📊 Total tables found: {len(tables)}")
         
-        return all_tables
+        # Summary by type (Counter counts in C, in first-seen order)
+        type_counts = Counter(table['type'] for table in tables)
+        
+        print(f"\n   📋 Tables by type:")
+        for t_type, count in type_counts.items():
+            print(f"      {t_type}: {count}")
     
     def _table_to_dataframe(self, table: List[List]) -> pd.DataFrame:
         """
@@ -171,46 +359,88 @@ class TableExtractor:
         data_rows = table[1:]
         
         # Clean headers
-        headers = [str(h).strip() if h else f"Column_{i}" 
-                   for i, h in enumerate(headers)]
+        headers = self._clean_headers(headers)
+        
+        # Clean data while building the rows
+        data_rows = [
+            [str(x).strip() if x else "" for x in row]
+            for row in data_rows
+        ]
         
         # Create DataFrame
         df = pd.DataFrame(data_rows, columns=headers)
         
-        # Clean data
-        df = df.applymap(lambda x: str(x).strip() if x else "")
-        
         return df
     
-    def _identify_table_type(
+    @staticmethod
+    def _clean_headers(row: List) -> List[str]:
+        """
+        Clean a header row (empty cells become Column_<index>)
+        
+        Args:
+            row: First row of a raw table
+        
+        Returns:
+            Column names
+        """
+        return [str(h).strip() if h else f"Column_{i}" 
+                for i, h in enumerate(row)]
+    
+    def _classify_raw(
         self, 
-        df: pd.DataFrame, 
-        page_text: str
+        table: List[List], 
+        page_text_lower: str
     ) -> str:
         """
-        Identify type of financial table
+        Identify type of financial table from its raw cells
+        
+        Sources are checked from most to least specific - column headers,
+        then the start of the first column, then the start of the page
+        text - and the first source that matches any type decides. Later
+        sources are only built on a miss. Cells are cleaned as in
+        _table_to_dataframe, so the result is the same as classifying the
+        DataFrame.
         
         Args:
-            df: Table DataFrame
-            page_text: Text from the page
+            table: 2D cell array (header row first)
+            page_text_lower: Start of the page text (classify_page_chars),
+                lowercased once per page by the caller
         
         Returns:
             Table type string
         """
-        # Combine sources for checking
-        text_to_check = (
-            page_text.lower() + " " + 
-            " ".join(df.columns).lower() + " " +
-            " ".join(df.iloc[:, 0].astype(str)).lower()
+        # The patterns are all lowercase, so no IGNORECASE case-folding
+        table_type = self._match_table_type(
+            " ".join(self._clean_headers(table[0])).lower()
         )
         
-        # Check each pattern
-        for table_type, patterns in self.table_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_to_check, re.IGNORECASE):
-                    return table_type
+        if table_type is None:
+            table_type = self._match_table_type(" ".join(
+                str(row[0]).strip() if row[0] else ""
+                for row in table[1:1 + self.classify_rows]
+            ).lower())
+        
+        if table_type is None:
+            table_type = self._match_table_type(page_text_lower)
+        
+        return table_type or 'other'
+    
+    def _match_table_type(self, text: str) -> Optional[str]:
+        """
+        Find the first table type whose patterns match text
+        
+        Args:
+            text: Lowercased text
+        
+        Returns:
+            Table type string, or None
+        """
+        # Check each type (patterns are tried in table_patterns order)
+        for table_type, regex in self._compiled_patterns.items():
+            if regex.search(text):
+                return table_type
         
-        return 'other'
+        return None
     
     def extract_financial_statements(
         self, 
@@ -244,38 +474,133 @@ class TableExtractor:
     
     def save_tables_to_excel(
         self, 
-        tables: List[Dict], 
-        output_path: str
-    ):
+        tables: Iterable[Dict], 
+        output_path: str,
+        limit: int = 20
+    ) -> int:
         """
         Save extracted tables to Excel file
         
+        Tables are written as they are consumed, so a generator such as
+        iter_tables() is only advanced until limit tables are saved.
+        
         Args:
-            tables: List of table dictionaries
+            tables: Table dictionaries (list or iterator)
             output_path: Output Excel file path
+            limit: Maximum number of tables (sheets) to write
+        
+        Returns:
+            Number of tables written
         """
         if self.verbose:
             print(f"\n💾 Saving tables to Excel: {output_path}")
         
+        tables = islice(tables, limit)
+        first = next(tables, None)
+        
+        # Neither Excel engine can save a workbook without sheets
+        if first is None:
+            if self.verbose:
+                print("   ⚠️  No tables to save")
+            return 0
+        
         # Ensure directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for i, table in enumerate(tables[:20]):  # Max 20 tables
+        if xlsxwriter is not None:
+            # constant_memory streams each finished row to a temp file
+            # instead of keeping every cell of the workbook in memory.
+            # Cells are extracted text, so no URL/formula conversion
+            book = xlsxwriter.Workbook(output_path, {
+                'constant_memory': True,
+                'strings_to_urls': False,
+                'strings_to_formulas': False
+            })
+            header_format = book.add_format(
+                {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+            )
+            write_sheet = lambda name, df: self._write_sheet_rows(book, name, df, header_format)
+            close = book.close
+        else:
+            writer = pd.ExcelWriter(output_path, engine='openpyxl')
+            write_sheet = lambda name, df: df.to_excel(writer, sheet_name=name, index=False)
+            close = writer.close
+        
+        saved = 0
+        sheet_names = Counter()
+        try:
+            for i, table in enumerate(chain((first,), tables)):
+                # Several tables on one page share a base name, and a
+                # repeated name would overwrite the earlier sheet. Stays
+                # within Excel's 31 characters (20 + "_p" + page + "_n")
                 sheet_name = f"{table['type'][:20]}_p{table['page']}"
+                sheet_names[sheet_name] += 1
+                if sheet_names[sheet_name] > 1:
+                    sheet_name = f"{sheet_name}_{sheet_names[sheet_name]}"
                 
                 try:
-                    table['data'].to_excel(
-                        writer, 
-                        sheet_name=sheet_name,
-                        index=False
-                    )
+                    write_sheet(sheet_name, table['data'])
                 except Exception as e:
                     if self.verbose:
                         print(f"   ⚠️  Error saving table {i}: {e}")
+                else:
+                    saved += 1
+        finally:
+            close()
         
         if self.verbose:
-            print(f"   ✅ Saved {min(len(tables), 20)} tables to Excel")
+            print(f"   ✅ Saved {saved} tables to Excel")
+        
+        return saved
+    
+    def _write_sheet_rows(self, book, sheet_name: str, df: pd.DataFrame, header_format):
+        """
+        Write a DataFrame to a new xlsxwriter worksheet, row by row
+        
+        DataFrame.to_excel emits cells column by column, which loses data
+        in constant_memory mode (earlier rows are already flushed), so
+        the header and rows are written in order here.
+        
+        Args:
+            book: xlsxwriter Workbook (constant_memory)
+            sheet_name: Worksheet name
+            df: Table DataFrame
+            header_format: Format of the header row (bold, as pandas)
+        """
+        worksheet = book.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+        
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), 1):
+            worksheet.write_row(row_idx, 0, row)
+    
+    def extract_and_save_tables(
+        self, 
+        pdf_path: Union[str, BinaryIO], 
+        output_path: str,
+        max_pages: int = 200,
+        limit: int = 20
+    ) -> int:
+        """
+        Extract tables straight into an Excel file
+        
+        Each table is written as soon as it is classified, and page
+        processing stops once limit tables are saved, so only one
+        DataFrame is held at a time.
+        
+        Args:
+            pdf_path: Path to PDF file, or an open binary buffer
+            output_path: Output Excel file path
+            max_pages: Maximum pages to process
+            limit: Maximum number of tables (sheets) to write
+        
+        Returns:
+            Number of tables written
+        """
+        return self.save_tables_to_excel(
+            self.iter_tables(pdf_path, max_pages),
+            output_path,
+            limit=limit
+        )
 
 
 # ============================================
@@ -3,8 +3,361 @@ Utility Functions - Helper functions for the compliance system
 Author: Nawddeep
 Date: February 2026
 
-Reserved for future utility functions.
+Features:
+- Content hashing of input files (BLAKE3 when installed, SHA-256 otherwise)
+- On-disk pipeline result cache (pickle, atomic writes, private directory)
+- Streaming JSON output (orjson when installed, stdlib json otherwise)
+- Memory-mapped PDF buffers shared by the extractors
+- pypdfium2 / PyMuPDF input adapters used by both extractors
+- Logging setup for the command-line scripts
 """
 
-# Utility functions will be added here as needed
-# Examples: file handling, data formatting, logging, etc.
+import ctypes
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import stat
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Sequence, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import blake3
+except ImportError:  # optional dependency
+    blake3 = None
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Hash a file's contents without loading it into memory
+
+    Uses BLAKE3 (SIMD, multi-threaded over an mmap of the file) when the
+    blake3 package is installed, otherwise SHA-256 in block_size reads.
+
+    Args:
+        path: File to hash
+        block_size: Read size for the SHA-256 fallback (default: 1 MiB)
+
+    Returns:
+        Hex digest
+    """
+    if blake3 is not None:
+        digest = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        digest.update_mmap(path)
+        return digest.hexdigest()
+
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def map_pdf(path: str) -> mmap.mmap:
+    """
+    Memory-map a PDF for the extractors
+
+    The mapping is private copy-on-write: pages come straight from the OS
+    page cache (nothing is copied unless written), and the buffer is
+    writable so pypdfium2 can read it in place. pdfplumber reads it as a
+    regular file object.
+
+    Args:
+        path: PDF file
+
+    Returns:
+        mmap object (close it, or let it be collected, when done)
+    """
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
+def pdfium_input(pdf_path: Union[str, BinaryIO]):
+    """
+    Adapt a path or buffer to an input pypdfium2 accepts
+    
+    A writable (copy-on-write) mmap is exposed as a ctypes array so
+    pdfium reads the mapping in place instead of a copy.
+    
+    Args:
+        pdf_path: Path to PDF or open binary buffer
+    
+    Returns:
+        PdfDocument input
+    """
+    if isinstance(pdf_path, mmap.mmap):
+        try:
+            return (ctypes.c_char * len(pdf_path)).from_buffer(pdf_path)
+        except TypeError:
+            # Read-only mapping - fall back to a bytes copy
+            return pdf_path[:]
+    
+    return pdf_path
+
+
+def pdfium_page_text(pdf, page_index: int) -> str:
+    """
+    Read one page's text with pypdfium2
+    
+    Args:
+        pdf: Open pdfium.PdfDocument
+        page_index: Zero-based page index
+    
+    Returns:
+        Page text with '\n' line endings (pdfium emits '\r\n')
+    """
+    page = pdf[page_index]
+    textpage = page.get_textpage()
+    
+    try:
+        text = textpage.get_text_range()
+    finally:
+        textpage.close()
+        page.close()
+    
+    return text.replace('\r\n', '\n').strip()
+
+
+def open_pymupdf(pdf_path: Union[str, BinaryIO]):
+    """
+    Open a path or buffer with PyMuPDF
+    
+    Args:
+        pdf_path: Path to PDF or open binary buffer
+    
+    Returns:
+        pymupdf.Document
+    """
+    import pymupdf
+    
+    if hasattr(pymupdf, 'no_recommend_layout'):
+        # find_tables otherwise prints an install hint to stdout
+        pymupdf.no_recommend_layout()
+    
+    if isinstance(pdf_path, str):
+        return pymupdf.open(pdf_path)
+    
+    # PyMuPDF takes bytes-like objects and file objects, but not mmap
+    stream = memoryview(pdf_path) if isinstance(pdf_path, mmap.mmap) else pdf_path
+    return pymupdf.open(stream=stream, filetype='pdf')
+
+
+# Bump when extraction, segmentation or check results change, so entries
+# written by an older pipeline are no longer served
+CACHE_VERSION = 2
+
+
+def pipeline_cache_dir(output_dir: str) -> Path:
+    """
+    Cache directory of the runs whose reports go to output_dir
+
+    Args:
+        output_dir: Report output directory (main.py --out)
+
+    Returns:
+        Path of the cache directory
+    """
+    return Path(output_dir) / ".cache"
+
+
+def pipeline_cache_path(
+    cache_dir: str,
+    pdf_path: str,
+    rules_path: str,
+    max_pages: int,
+    backends: Sequence[str] = ()
+) -> Path:
+    """
+    Build the cache file path for one analysis run
+
+    The name combines the PDF content hash, the rules file hash, the cache
+    version, the extraction backends and the page limit, so changing any
+    of them invalidates the entry.
+
+    Args:
+        cache_dir: Cache directory
+        pdf_path: Analyzed PDF
+        rules_path: Rules JSON used for compliance checking
+        max_pages: Page limit of the run
+        backends: Text and table backends of the run
+
+    Returns:
+        Path of the cache entry
+    """
+    pdf_key = file_digest(pdf_path)
+    rules_key = file_digest(rules_path)[:16]
+    parts = [pdf_key, rules_key, f"v{CACHE_VERSION}", *backends, f"p{max_pages}"]
+
+    return Path(cache_dir) / ("-".join(parts) + ".pkl")
+
+
+def find_cache_entry(cache_dir: str, pdf_path: str, min_pages: int) -> Optional[Path]:
+    """
+    Find a cached run of this PDF that covers at least min_pages pages
+
+    Text extraction of the first N pages is a prefix of any run with a
+    larger limit, so the smallest covering entry (any rules file or
+    backends, current cache version) can be sliced instead of re-parsing
+    the PDF.
+
+    Args:
+        cache_dir: Cache directory
+        pdf_path: Analyzed PDF
+        min_pages: Page limit the caller needs
+
+    Returns:
+        Path of the best entry, or None
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        return None
+
+    pdf_key = file_digest(pdf_path)
+    best, best_pages = None, None
+
+    for entry in cache_dir.glob(f"{pdf_key}-*.pkl"):
+        parts = entry.stem.split('-')
+        if len(parts) < 4 or parts[2] != f"v{CACHE_VERSION}" or parts[-1][:1] != 'p':
+            continue
+        try:
+            pages = int(parts[-1][1:])
+        except ValueError:
+            continue
+
+        if pages >= min_pages and (best_pages is None or pages < best_pages):
+            best, best_pages = entry, pages
+
+    return best
+
+
+def _trusted_cache_dir(cache_dir: Path) -> bool:
+    """
+    Check that entries in cache_dir are safe to unpickle
+
+    pickle.load can run arbitrary code, so entries are only read from a
+    directory owned by the current user that no one else can write to.
+
+    Args:
+        cache_dir: Directory holding the entry
+
+    Returns:
+        True if the directory is private to the current user
+    """
+    if not hasattr(os, 'getuid'):  # no POSIX owners/modes (Windows)
+        return True
+
+    try:
+        st = os.stat(cache_dir)
+    except OSError:
+        return False
+
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def load_cache(cache_path: Path) -> Optional[Any]:
+    """
+    Load a cache entry
+
+    Args:
+        cache_path: Path from pipeline_cache_path
+
+    Returns:
+        Cached object, or None on a miss (missing, unreadable or untrusted
+        entry)
+    """
+    if not _trusted_cache_dir(Path(cache_path).parent):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt or incompatible entry - treat as a miss
+        return None
+
+
+def save_cache(cache_path: Path, data: Any):
+    """
+    Write a cache entry atomically (temp file + rename)
+
+    A new cache directory is created private to the current user (see
+    load_cache).
+
+    Args:
+        cache_path: Path from pipeline_cache_path
+        data: Picklable object to store
+    """
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    tmp_path = cache_path.with_suffix('.tmp')
+    tmp_path.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp_path.replace(cache_path)
+
+
+def write_json(path: str, data: Any):
+    """
+    Write data as indented UTF-8 JSON, streaming it to the file
+
+    A top-level dict is written one key at a time, so only the encoding of
+    a single value is held in memory next to the data itself. Uses orjson
+    (C, serializes straight to bytes) when available and falls back to the
+    stdlib encoder's chunked iterencode.
+
+    Args:
+        path: Output file path
+        data: JSON-serializable object
+    """
+    if orjson is None:
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(encoder.iterencode(data))
+        return
+
+    # Non-str keys (int, float, bool, None) are written the way the stdlib
+    # encoder writes them
+    option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    
+    with open(path, 'wb') as f:
+        if not isinstance(data, dict) or not data:
+            f.write(orjson.dumps(data, option=option))
+            return
+
+        f.write(b'{')
+        for i, (key, value) in enumerate(data.items()):
+            # Nested lines get the extra level of indentation; JSON strings
+            # never contain raw newlines, so the replace is safe
+            encoded = orjson.dumps(value, option=option).replace(b'\n', b'\n  ')
+            f.write(b'\n  ' if i == 0 else b',\n  ')
+            f.write(orjson.dumps(key if isinstance(key, str) else json.dumps(key)))
+            f.write(b': ')
+            f.write(encoded)
+        f.write(b'\n}')
+
+
+def configure_logging(default_level: str = "ERROR"):
+    """
+    Configure root logging from the LOGLEVEL environment variable
+
+    Unknown level names fall back to default_level. Setting
+    LOGLEVEL=CRITICAL silences the error tracebacks of the scripts.
+
+    Args:
+        default_level: Level used when LOGLEVEL is unset or invalid
+    """
+    level = logging.getLevelName(os.environ.get("LOGLEVEL", default_level).upper())
+    if not isinstance(level, int):
+        level = logging.getLevelName(default_level)
+
+    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
@@ -0,0 +1,28 @@
+"""
+Shared pytest setup - makes the src.* modules and main.py importable
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SAMPLE_PDF = ROOT / "data" / "sample_document" / "Dixon_2025.pdf"
+RULES_PATH = ROOT / "data" / "regulations" / "rules_index.json"
+
+
+@pytest.fixture
+def sample_pdf():
+    """Path of the bundled sample annual report"""
+    if not SAMPLE_PDF.exists():
+        pytest.skip("sample PDF not available")
+    return str(SAMPLE_PDF)
+
+
+@pytest.fixture
+def rules_path():
+    """Path of the bundled rules index"""
+    return str(RULES_PATH)
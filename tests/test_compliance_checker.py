@@ -0,0 +1,136 @@
+"""
+Tests for ComplianceChecker - keyword scanners, batch checking, short_circuit
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.compliance_checker import ComplianceChecker, ahocorasick
+
+
+@pytest.fixture
+def checker(rules_path):
+    return ComplianceChecker(rules_path=rules_path, verbose=False)
+
+
+def comparable(results):
+    """Results without the run timestamp"""
+    return {k: v for k, v in results.items() if k != 'timestamp'}
+
+
+def use_scanner(checker, scanner):
+    """Switch a checker to one keyword scanner: hyperscan, ahocorasick or find"""
+    if scanner == 'hyperscan':
+        if checker._keyword_db is None:
+            pytest.skip("hyperscan not installed")
+        return
+
+    checker._keyword_db = None
+    checker._keyword_scratch = None
+    if scanner == 'ahocorasick':
+        if ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+        checker._automaton = checker._build_automaton()
+    else:
+        checker._automaton = None
+
+
+def sample_document(checker, prefix=""):
+    """Text satisfying every other check (all its keywords, in varied case)"""
+    checks = [check for standard in checker._standards for check in standard.checks]
+    lines = [
+        f"Note {i}: the {keyword.title()} is disclosed on this page."
+        for i, check in enumerate(checks[::2])
+        for keyword in check.keywords_lower
+    ]
+    return prefix + "\n".join(lines)
+
+
+@pytest.mark.parametrize('prefix', ["", "Amounts in ₹ crore — "])
+@pytest.mark.parametrize('scanner', ['ahocorasick', 'find'])
+def test_scanners_agree_with_hyperscan(rules_path, scanner, prefix):
+    reference = ComplianceChecker(rules_path=rules_path, verbose=False)
+    use_scanner(reference, 'hyperscan')
+    other = ComplianceChecker(rules_path=rules_path, verbose=False)
+    use_scanner(other, scanner)
+    text = sample_document(reference, prefix)
+
+    expected = comparable(reference.check_compliance(document_text=text))
+
+    assert comparable(other.check_compliance(document_text=text)) == expected
+    assert 0 < expected['summary']['compliant'] < expected['summary']['total_checks']
+
+
+def test_page_texts_match_document_text(checker):
+    pages = [
+        {'page_number': 1, 'text': "Standalone BALANCE SHEET as at 31 March"},
+        {'page_number': 2, 'text': ""},
+        {'page_number': 3, 'text': "Statement of Cash Flows"}
+    ]
+    text = "".join(p['text'] + "\n\n" for p in pages if p['text'])
+
+    assert (comparable(checker.check_compliance(page_texts=pages))
+            == comparable(checker.check_compliance(document_text=text)))
+
+
+def test_non_compliant_items_match_detailed_results(checker):
+    results = checker.check_compliance(document_text=sample_document(checker))
+    items = results.pop('non_compliant_items')
+
+    assert items
+    assert items == checker.get_non_compliant_items(results)
+
+
+def test_batch_matches_single_documents(checker):
+    documents = [
+        sample_document(checker),
+        [{'page_number': 1, 'text': "Independent Auditor's Report"}],
+        ""
+    ]
+    expected = [
+        checker.check_compliance(document_text=documents[0]),
+        checker.check_compliance(page_texts=documents[1]),
+        checker.check_compliance(document_text=documents[2])
+    ]
+
+    batch = list(checker.check_compliance_batch(iter(documents)))
+
+    assert [comparable(r) for r in batch] == [comparable(r) for r in expected]
+
+
+def test_short_circuit_stops_at_first_high_priority_failure(checker):
+    results = checker.check_compliance(
+        document_text="",
+        short_circuit=ComplianceChecker.fail_on_high_priority_mandatory
+    )
+
+    assert results['short_circuited'] is True
+    assert len(results['detailed_results']) == 1
+    assert len(results['detailed_results'][0]['checks']) == 1
+    # Checks not run count as not achieved
+    assert results['summary']['total_checks'] == checker._total_checks
+    assert results['summary']['compliance_score'] == 0
+
+
+def test_short_circuit_not_triggered_runs_every_check(checker):
+    results = checker.check_compliance(
+        document_text=sample_document(checker),
+        short_circuit=lambda summary, standard, check: False
+    )
+
+    assert 'short_circuited' not in results
+    assert sum(len(s['checks']) for s in results['detailed_results']) == checker._total_checks
+
+
+def test_checker_can_be_shared_between_threads(checker):
+    documents = [sample_document(checker, prefix=f"Report {i} ") for i in range(8)]
+    expected = [comparable(checker.check_compliance(document_text=d)) for d in documents]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda d: comparable(checker.check_compliance(document_text=d)),
+            documents * 4
+        ))
+
+    assert results == expected * 4
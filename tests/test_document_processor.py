@@ -0,0 +1,52 @@
+"""
+Tests for DocumentProcessor - digital-text probe and input types
+"""
+
+import pytest
+
+from src.document_processor import DocumentProcessor, pymupdf
+from src.utils import map_pdf
+
+
+@pytest.fixture
+def blank_pdf(tmp_path):
+    """A PDF with one page and no text layer (as a scan without OCR)"""
+    if pymupdf is None:
+        pytest.skip("PyMuPDF not installed")
+    path = tmp_path / "blank.pdf"
+    document = pymupdf.open()
+    document.new_page()
+    document.save(str(path))
+    document.close()
+    return str(path)
+
+
+def test_probe_digital_on_text_pdf(sample_pdf):
+    assert DocumentProcessor(verbose=False).probe_digital(sample_pdf) is True
+
+
+def test_probe_digital_on_pdf_without_text(blank_pdf):
+    assert DocumentProcessor(verbose=False).probe_digital(blank_pdf) is False
+
+
+def test_probe_digital_keeps_verbose_setting(sample_pdf):
+    processor = DocumentProcessor(verbose=False)
+    processor.verbose = True
+
+    processor.probe_digital(sample_pdf, sample_pages=1, min_text_threshold=1)
+
+    assert processor.verbose is True
+
+
+@pytest.mark.parametrize('backend', ['pypdfium2', 'pymupdf', 'pdfplumber'])
+def test_mapped_buffer_matches_path(sample_pdf, backend):
+    processor = DocumentProcessor(verbose=False)
+
+    from_path = processor.extract_text_from_pdf(
+        sample_pdf, max_pages=3, min_text_threshold=0, backend=backend
+    )
+    from_buffer = processor.extract_text_from_pdf(
+        map_pdf(sample_pdf), max_pages=3, min_text_threshold=0, backend=backend
+    )
+
+    assert from_buffer['page_texts'] == from_path['page_texts']
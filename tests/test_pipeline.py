@@ -0,0 +1,144 @@
+"""
+Tests for main.py page sharding - chunked extraction must match a serial
+pass, and a failed chunk must be reported rather than dropped
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import pytest
+
+import main
+from src.document_processor import DocumentProcessor
+from src.table_extractor import TableExtractor
+
+PAGES = 12
+
+_extract_text_chunk = main._extract_text_chunk
+
+
+@pytest.mark.parametrize('max_pages, jobs', [(1, 1), (10, 3), (12, 4), (5, 8), (150, 1)])
+def test_shard_pages_covers_every_page_once_in_order(max_pages, jobs):
+    shards = main._shard_pages(max_pages, jobs)
+
+    assert [i for shard in shards for i in shard] == list(range(max_pages))
+    assert all(shards)
+    assert len(shards) <= jobs
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_sharded_text_matches_serial(sample_pdf, executor, jobs):
+    processor = DocumentProcessor(verbose=False)
+    serial = processor.extract_text_from_pdf(
+        sample_pdf, max_pages=PAGES, min_text_threshold=0, backend=main.TEXT_BACKEND
+    )
+
+    futures = main.submit_chunks(executor, main._extract_text_chunk, sample_pdf, PAGES, jobs)
+    sharded = main.collect_text(processor, futures, sample_pdf, PAGES)
+
+    assert sharded['page_texts'] == serial['page_texts']
+    assert DocumentProcessor.join_pages(sharded['page_texts']) == serial['text']
+    for key in ('processed_pages', 'total_characters', 'total_words', 'pages_with_text'):
+        assert sharded['metadata'][key] == serial['metadata'][key]
+
+
+def test_sharded_tables_match_serial(sample_pdf, executor):
+    serial = TableExtractor(verbose=False, backend=main.TABLE_BACKEND).extract_all_tables(
+        sample_pdf, max_pages=PAGES
+    )
+
+    futures = main.submit_chunks(executor, main._extract_tables_chunk, sample_pdf, PAGES, 3)
+    sharded = main.collect_tables(futures)
+
+    assert serial
+    assert [(t['page'], t['type']) for t in sharded] == [(t['page'], t['type']) for t in serial]
+    for got, expected in zip(sharded, serial):
+        assert got['data'].equals(expected['data'])
+
+
+def done(result=None, error=None):
+    """A finished future, as returned by submit_chunks"""
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+def failed_chunk(message):
+    return {'page_texts': [], 'metadata': {'method': 'digital', 'error': message}}
+
+
+def text_chunk_failing_from_page_4(pdf_path, page_numbers):
+    """Worker stand-in: the chunk starting at page 4 fails"""
+    if page_numbers[0] >= 3:
+        return failed_chunk("simulated chunk failure")
+    return _extract_text_chunk(pdf_path, page_numbers)
+
+
+def table_chunk_failing(pdf_path, page_numbers):
+    """Worker stand-in: every table chunk fails"""
+    raise RuntimeError("simulated table failure")
+
+
+def test_failed_text_chunk_is_reported(sample_pdf):
+    processor = DocumentProcessor(verbose=False)
+    futures = [done(_extract_text_chunk(sample_pdf, [0, 1, 2])), done(failed_chunk("boom"))]
+
+    result = main.collect_text(processor, futures, sample_pdf, 6)
+
+    assert result['metadata']['error'] == "boom"
+    assert result['metadata']['processed_pages'] == 3
+
+
+def test_failed_table_chunk_raises():
+    futures = [done([{'page': 1}]), done(error=RuntimeError("boom"))]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        main.collect_tables(futures)
+
+
+def test_low_text_falls_back_to_ocr_without_rerunning_extraction(sample_pdf, monkeypatch):
+    processor = DocumentProcessor(verbose=False)
+    ocr_calls = []
+
+    def fake_ocr(pdf_path, max_pages=10):
+        ocr_calls.append((pdf_path, max_pages))
+        return {'text': "ocr text", 'page_texts': [], 'metadata': {'method': 'ocr'}}
+
+    def no_rerun(*args, **kwargs):
+        raise AssertionError("digital extraction rerun before OCR")
+
+    monkeypatch.setattr(processor, '_extract_with_ocr', fake_ocr)
+    monkeypatch.setattr(processor, 'extract_text_from_pdf', no_rerun)
+    futures = [done(_extract_text_chunk(sample_pdf, [1]))]  # a few hundred characters
+
+    result = main.collect_text(processor, futures, sample_pdf, 6)
+
+    assert ocr_calls == [(sample_pdf, 6)]
+    assert result['metadata']['method'] == 'ocr'
+
+
+@pytest.mark.parametrize('worker, chunk', [
+    ('_extract_text_chunk', text_chunk_failing_from_page_4),
+    ('_extract_tables_chunk', table_chunk_failing),
+])
+def test_failed_chunk_marks_run_degraded(sample_pdf, rules_path, tmp_path, monkeypatch, worker, chunk):
+    # Workers are forked after the patch, so they run the stand-in
+    monkeypatch.setattr(main, worker, chunk)
+
+    analysis = main.analyze_document(
+        sample_pdf, rules_path, str(tmp_path), max_pages=6, jobs=2, save_excel=False
+    )
+
+    assert analysis['degraded'] is True
+    if worker == '_extract_text_chunk':
+        assert [p['page_num'] for p in analysis['extraction_result']['page_texts']] == [1, 2, 3]
+    else:
+        assert analysis['tables'] == []
@@ -0,0 +1,82 @@
+"""
+Tests for ReportGenerator - streamed HTML output and batch generation
+"""
+
+import io
+import re
+
+import pytest
+
+from src.compliance_checker import ComplianceChecker
+from src.report_generator import ReportGenerator
+
+STATS = {'method': 'digital', 'total_pages': 2, 'total_characters': 1234, 'total_words': 210}
+
+
+@pytest.fixture
+def results(rules_path):
+    checker = ComplianceChecker(rules_path=rules_path, verbose=False)
+    return checker.check_compliance(
+        document_text="Standalone Balance Sheet. Statement of Cash Flows. <b>Auditor</b> & co."
+    )
+
+
+@pytest.fixture
+def generator():
+    return ReportGenerator(verbose=False)
+
+
+def without_times(html):
+    """Report HTML with the generation time stamps removed"""
+    html = re.sub(r"Generated on [^<]*", "Generated on", html)
+    return re.sub(r"Analysis Date:</strong> [^<]*", "Analysis Date:</strong>", html)
+
+
+def test_file_matches_streamed_html(generator, results, tmp_path):
+    path = generator.generate_html_report(
+        results, STATS, "Dixon_2025.pdf", str(tmp_path / "nested" / "report.html")
+    )
+    buffer = io.StringIO()
+    generator._write_html(buffer, results, STATS, "Dixon_2025.pdf")
+
+    html = open(path, encoding='utf-8').read()
+    assert without_times(html) == without_times(buffer.getvalue())
+    assert html.startswith("<!DOCTYPE html>") and html.endswith("</html>")
+    assert html.count('class="standard-group"') == len(results['detailed_results'])
+    checks = sum(len(s['checks']) for s in results['detailed_results'])
+    assert html.count('class="check-item ') == checks
+
+
+def test_document_and_rule_text_is_escaped(generator, results, tmp_path):
+    path = generator.generate_html_report(
+        results, STATS, "<script>alert(1)</script>.pdf", str(tmp_path / "report.html")
+    )
+
+    html = open(path, encoding='utf-8').read()
+    assert "<script>" not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;.pdf" in html
+    assert "&lt;b&gt;auditor&lt;/b&gt; &amp; co." in html
+
+
+def test_generate_many_matches_single_reports(generator, results, tmp_path):
+    reports = [
+        {'compliance_results': results, 'extraction_stats': STATS, 'pdf_filename': "Dixon_2025.pdf"},
+        {'compliance_results': results, 'pdf_filename': "HDFC_2025.pdf",
+         'output_path': str(tmp_path / "custom" / "hdfc.html")},
+        {'compliance_results': results},
+    ]
+
+    paths = generator.generate_many(iter(reports), str(tmp_path / "batch"))
+
+    assert paths == [
+        str(tmp_path / "batch" / "compliance_report_Dixon_2025.html"),
+        str(tmp_path / "custom" / "hdfc.html"),
+        str(tmp_path / "batch" / "compliance_report_Unknown.html"),
+    ]
+    single = generator.generate_html_report(
+        results, STATS, "Dixon_2025.pdf", str(tmp_path / "single.html")
+    )
+    assert (without_times(open(paths[0], encoding='utf-8').read())
+            == without_times(open(single, encoding='utf-8').read()))
+    # The caller's dicts are left untouched
+    assert reports[1]['output_path'] == str(tmp_path / "custom" / "hdfc.html")
@@ -0,0 +1,113 @@
+"""
+Tests for DocumentSegmenter - word prefilter, anchored sections, section text
+"""
+
+import pytest
+
+from src.segmentor import DocumentSegmenter
+
+PAGES = [
+    "Company overview and highlights",
+    "Board's Report to the shareholders",
+    "Management's Discussion and Analysis of the year",
+    "MD & A continued; report on corporate governance",
+    "Independent Auditor's Report on the standalone statements",
+    "Standalone Balance Sheet as at 31 March 2025",
+    "Statement of Profit and Loss for the year",
+    "Statement of Cash Flows; see the balance sheet",
+    "Statement of Changes in Equity",
+    "Notes to the Financial Statements",
+    "Notes forming part of the accounts (continued)",
+    "Statement of financial position (consolidated)",
+    "",
+]
+
+
+@pytest.fixture
+def page_texts():
+    return [{'page_num': i, 'text': text} for i, text in enumerate(PAGES, 1)]
+
+
+@pytest.fixture
+def segmenter():
+    return DocumentSegmenter(verbose=False)
+
+
+def pages_of(sections):
+    return {name: list(data['pages']) for name, data in sections.items()}
+
+
+def test_prefilter_never_drops_a_match(segmenter, page_texts):
+    pages_lower = [p['text'].lower() for p in page_texts]
+
+    for name, regex in segmenter._section_regexes.items():
+        with_prefilter = segmenter._find_section(
+            page_texts, pages_lower, regex, name, segmenter._section_literals[name]
+        )
+        without_prefilter = segmenter._find_section(page_texts, pages_lower, regex, name)
+
+        assert list(with_prefilter['pages']) == list(without_prefilter['pages']), name
+
+
+def test_every_page_mentioning_a_section_is_listed(segmenter, page_texts):
+    sections = segmenter.segment_document(page_texts)
+
+    pages = pages_of(sections)
+    assert pages['balance_sheet'] == [6, 8, 12]
+    assert pages['directors_report'] == [2]
+    assert pages['management_discussion'] == [3, 4]
+    assert sections['balance_sheet']['start_page'] == 6
+    assert sections['balance_sheet']['end_page'] == 12
+    assert sections['balance_sheet']['total_chars'] == len(PAGES[5]) + len(PAGES[7]) + len(PAGES[11])
+
+
+def test_anchored_sections_are_disjoint_page_ranges(segmenter, page_texts):
+    sections = segmenter.segment_document(page_texts, anchored=True)
+
+    pages = pages_of(sections)
+    assert pages['directors_report'] == [2]
+    assert pages['management_discussion'] == [3]
+    assert pages['corporate_governance'] == [4]
+    assert pages['auditor_report'] == [5]
+    # Each section starts once; later mentions (pages 8 and 12) stay in
+    # the section that is current
+    assert pages['balance_sheet'] == [6]
+    assert pages['cash_flow'] == [8]
+    assert pages['notes_to_accounts'] == [10, 11, 12, 13]
+
+    assigned = [page for section in pages.values() for page in section]
+    assert sorted(assigned) == list(range(2, len(PAGES) + 1))
+
+
+def test_anchored_page_with_two_titles_goes_to_higher_priority(segmenter):
+    page_texts = [
+        {'page_num': 1, 'text': "Director's Report and Balance Sheet"},
+        {'page_num': 2, 'text': "Director's Report continued"},
+    ]
+
+    pages = pages_of(segmenter.segment_document(page_texts, anchored=True))
+
+    assert pages['balance_sheet'] == [1]
+    assert pages['directors_report'] == [2]
+
+
+def test_get_section_text_joins_pages_once(segmenter, page_texts):
+    sections = segmenter.segment_document(page_texts)
+
+    text = segmenter.get_section_text(sections, 'management_discussion', page_texts)
+
+    assert text == PAGES[2] + "\n" + PAGES[3] + "\n"
+    assert sections['management_discussion']['text'] is text
+    page_texts[2]['text'] = "changed"
+    assert segmenter.get_section_text(sections, 'management_discussion', page_texts) is text
+
+
+def test_build_document_structure_metadata(segmenter, page_texts):
+    plain = segmenter.build_document_structure(page_texts)
+    anchored = segmenter.build_document_structure(page_texts, anchored=True)
+
+    assert plain['total_pages'] == len(PAGES)
+    assert plain['metadata']['segmentation_method'] == 'regex_pattern_matching'
+    assert anchored['metadata']['segmentation_method'] == 'anchored_page_ranges'
+    assert plain['metadata']['sections_found'] == 9
+    assert anchored['metadata']['sections_found'] == 9
@@ -0,0 +1,147 @@
+"""
+Tests for TableExtractor - table classification and Excel export
+(openpyxl and xlsxwriter engines)
+"""
+
+import re
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src import table_extractor
+from src.table_extractor import TableExtractor
+
+
+@pytest.fixture(params=['openpyxl', 'xlsxwriter'])
+def engine(request, monkeypatch):
+    """Run a test once per Excel engine (xlsxwriter only when installed)"""
+    if request.param == 'xlsxwriter':
+        module = pytest.importorskip('xlsxwriter')
+    else:
+        module = None
+    monkeypatch.setattr(table_extractor, 'xlsxwriter', module)
+    return request.param
+
+
+def make_table(page, rows, table_type='balance_sheet'):
+    return {
+        'page': page,
+        'type': table_type,
+        'data': pd.DataFrame(rows[1:], columns=rows[0])
+    }
+
+
+def read_sheets(path):
+    book = load_workbook(path, read_only=True)
+    try:
+        return {
+            sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)]
+            for sheet in book.worksheets
+        }
+    finally:
+        book.close()
+
+
+def test_writes_every_row_with_unique_sheet_names(engine, tmp_path):
+    rows = [['Particulars', 'FY25', 'FY24'], ['Assets', '10', '9'], ['Equity', '4', '3']]
+    tables = [make_table(3, rows), make_table(3, rows), make_table(5, rows, 'cash_flow')]
+    output = tmp_path / "tables.xlsx"
+
+    saved = TableExtractor(verbose=False).save_tables_to_excel(tables, str(output))
+
+    assert saved == 3
+    sheets = read_sheets(output)
+    assert list(sheets) == ['balance_sheet_p3', 'balance_sheet_p3_2', 'cash_flow_p5']
+    for sheet_rows in sheets.values():
+        assert sheet_rows == rows
+
+
+def test_failed_sheet_is_not_counted(engine, tmp_path):
+    good = make_table(1, [['A', 'B'], ['1', '2']])
+    broken = {'page': 2, 'type': 'income_statement', 'data': None}
+    output = tmp_path / "tables.xlsx"
+
+    saved = TableExtractor(verbose=False).save_tables_to_excel([good, broken], str(output))
+
+    assert saved == 1
+    assert read_sheets(output)['balance_sheet_p1'] == [['A', 'B'], ['1', '2']]
+
+
+def test_limit_stops_consuming_the_iterator(engine, tmp_path):
+    consumed = []
+
+    def tables():
+        for page in range(1, 10):
+            consumed.append(page)
+            yield make_table(page, [['A'], ['x']])
+
+    saved = TableExtractor(verbose=False).save_tables_to_excel(
+        tables(), str(tmp_path / "tables.xlsx"), limit=2
+    )
+
+    assert saved == 2
+    assert consumed == [1, 2]
+
+
+def test_no_tables_writes_nothing(engine, tmp_path):
+    output = tmp_path / "tables.xlsx"
+
+    assert TableExtractor(verbose=False).save_tables_to_excel([], str(output)) == 0
+    assert not output.exists()
+
+
+@pytest.mark.parametrize('text', [
+    "Standalone BALANCE SHEET as at 31 March 2025",
+    "Statement of Financial Position",
+    "Total assets and total liabilities",
+    "Statement of Profit and Loss",
+    "Revenue from operations ... other expenses",
+    "Consolidated Cash Flow Statement",
+    "Net cash from operating, investing and financing activities",
+    "Statement of Changes in Equity",
+    "Profit\nand loss",
+    "Particulars  Note  FY25  FY24",
+    "",
+])
+def test_compiled_patterns_match_like_the_pattern_list(text):
+    expected = next(
+        (
+            table_type
+            for table_type, patterns in TableExtractor.table_patterns.items()
+            if any(re.search(p, text, re.IGNORECASE) for p in patterns)
+        ),
+        None
+    )
+
+    assert TableExtractor(verbose=False)._match_table_type(text.lower()) == expected
+
+
+def test_classify_prefers_headers_then_first_column_then_page():
+    extractor = TableExtractor(verbose=False)
+    first_column = [['Particulars', 'FY25'], ['Revenue', '1'], ['Total expenses', '2']]
+    page = "balance sheet as at 31 march"
+
+    assert extractor._classify_raw([['Cash Flow', 'FY25'], ['Revenue', '1']], page) == 'cash_flow'
+    assert extractor._classify_raw(first_column, page) == 'profit_loss'
+    assert extractor._classify_raw([['Particulars', None], ['Inventories', '1']], page) == 'balance_sheet'
+    assert extractor._classify_raw([['Particulars', None], ['Inventories', '1']], "") == 'other'
+
+
+def test_classify_reads_only_the_first_rows_of_the_first_column():
+    extractor = TableExtractor(verbose=False)
+    rows = [['Particulars', 'FY25']] + [[f'Item {i}', '1'] for i in range(extractor.classify_rows)]
+
+    assert extractor._classify_raw(rows + [['Cash flow', '1']], "") == 'other'
+    assert extractor._classify_raw(rows[:-1] + [['Cash flow', '1']], "") == 'cash_flow'
+
+
+def test_page_tables_can_skip_unclassified_tables():
+    tables = [[['Cash Flow', 'FY25'], ['Net cash', '1']], [['A', 'B'], ['1', '2']], [['Only header']]]
+
+    kept = list(TableExtractor(verbose=False)._page_tables("", tables, 4))
+    financial = list(TableExtractor(verbose=False, keep_other=False)._page_tables("", tables, 4))
+
+    assert [(t['page'], t['table_index'], t['type']) for t in kept] == [(5, 0, 'cash_flow'), (5, 1, 'other')]
+    assert [t['type'] for t in financial] == ['cash_flow']
+    assert kept[0]['data'].equals(pd.DataFrame([['Net cash', '1']], columns=['Cash Flow', 'FY25']))
@@ -0,0 +1,151 @@
+"""
+Tests for src/utils.py - cache keys, cache entries, JSON output, PDF buffers
+"""
+
+import ctypes
+import mmap
+
+import pytest
+
+from src import utils
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4 first version")
+    rules = tmp_path / "rules.json"
+    rules.write_text('{"IndAS-1": {"name": "x", "checks": []}}')
+    return pdf, rules
+
+
+def test_cache_path_is_stable(inputs, tmp_path):
+    pdf, rules = inputs
+
+    first = utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150)
+
+    assert first == utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150)
+    assert first.parent == tmp_path
+
+
+def test_cache_path_changes_with_page_limit(inputs, tmp_path):
+    pdf, rules = inputs
+
+    assert (utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 40)
+            != utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 10))
+
+
+def test_cache_path_changes_with_backends_and_version(inputs, tmp_path, monkeypatch):
+    pdf, rules = inputs
+    path = utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150, ('pypdfium2', 'pdfplumber'))
+
+    assert path != utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150, ('pypdfium2', 'pymupdf'))
+    monkeypatch.setattr(utils, 'CACHE_VERSION', utils.CACHE_VERSION + 1)
+    assert path != utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150, ('pypdfium2', 'pdfplumber'))
+
+
+def test_cache_path_changes_with_rules_content(inputs, tmp_path):
+    pdf, rules = inputs
+    before = utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150)
+
+    rules.write_text('{"IndAS-1": {"name": "y", "checks": []}}')
+
+    assert utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150) != before
+
+
+def test_cache_path_changes_with_pdf_content(inputs, tmp_path):
+    pdf, rules = inputs
+    before = utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150)
+
+    pdf.write_bytes(b"%PDF-1.4 second version")
+
+    assert utils.pipeline_cache_path(str(tmp_path), str(pdf), str(rules), 150) != before
+
+
+def test_find_cache_entry_picks_smallest_covering_run(inputs, tmp_path):
+    pdf, rules = inputs
+    cache_dir = tmp_path / "cache"
+    for pages in (10, 40, 150):
+        utils.save_cache(utils.pipeline_cache_path(str(cache_dir), str(pdf), str(rules), pages), pages)
+    # Entries of another PDF or cache version and unparsable names are ignored
+    pdf_key = utils.file_digest(str(pdf))
+    (cache_dir / f"0123abcd-rules-v{utils.CACHE_VERSION}-p20.pkl").write_bytes(b"")
+    (cache_dir / f"{pdf_key}-rules-v{utils.CACHE_VERSION - 1}-p20.pkl").write_bytes(b"")
+    (cache_dir / f"{pdf_key}-rules-p20.pkl").write_bytes(b"")
+    (cache_dir / f"{pdf_key}-rules-v{utils.CACHE_VERSION}-pXX.pkl").write_bytes(b"")
+
+    def best(min_pages):
+        entry = utils.find_cache_entry(str(cache_dir), str(pdf), min_pages)
+        return None if entry is None else utils.load_cache(entry)
+
+    assert best(5) == 10
+    assert best(10) == 10
+    assert best(20) == 40
+    assert best(150) == 150
+    assert best(151) is None
+
+
+def test_find_cache_entry_without_cache_dir(inputs, tmp_path):
+    pdf, _ = inputs
+
+    assert utils.find_cache_entry(str(tmp_path / "missing"), str(pdf), 1) is None
+
+
+def test_cache_round_trip_and_corrupt_entry(tmp_path):
+    entry = tmp_path / "entry.pkl"
+    utils.save_cache(entry, {'tables': [1, 2], 'degraded': False})
+
+    assert utils.load_cache(entry) == {'tables': [1, 2], 'degraded': False}
+    assert utils.load_cache(tmp_path / "missing.pkl") is None
+
+    entry.write_bytes(b"not a pickle")
+    assert utils.load_cache(entry) is None
+
+
+@pytest.mark.skipif(not hasattr(utils.os, 'getuid'), reason="POSIX permissions only")
+def test_cache_is_not_read_from_a_shared_directory(tmp_path):
+    entry = tmp_path / "cache" / "entry.pkl"
+    utils.save_cache(entry, {'tables': []})
+
+    assert entry.parent.stat().st_mode & 0o777 == 0o700
+    assert utils.load_cache(entry) == {'tables': []}
+
+    entry.parent.chmod(0o777)
+    assert utils.load_cache(entry) is None
+
+
+@pytest.mark.parametrize('data', [
+    {'pdf_file': 'Dixon_2025.pdf', 'tables_found': None, 'score': 87.5,
+     'nested': {'list': [1, 2.5, True, None], 'empty': {}, 'text': 'Amounts in ₹ — "quoted"'}},
+    {1: 'int key', 2.5: 'float key', True: 'bool key', None: 'null key', 'sub': {3: [4]}},
+    [{'a': 1}, [], 'x'],
+    {},
+    'plain string'
+])
+def test_write_json_same_bytes_with_and_without_orjson(data, tmp_path, monkeypatch):
+    if utils.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = tmp_path / "orjson.json"
+    utils.write_json(str(fast), data)
+
+    monkeypatch.setattr(utils, 'orjson', None)
+    plain = tmp_path / "stdlib.json"
+    utils.write_json(str(plain), data)
+
+    assert fast.read_bytes() == plain.read_bytes()
+
+
+def test_pdfium_input_reads_mappings_in_place(tmp_path):
+    path = tmp_path / "buffer.pdf"
+    path.write_bytes(b"%PDF-1.4 body")
+
+    mapped = utils.map_pdf(str(path))
+    adapted = utils.pdfium_input(mapped)
+    assert isinstance(adapted, ctypes.Array)
+    assert bytes(adapted) == b"%PDF-1.4 body"
+
+    with open(path, 'rb') as f:
+        read_only = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    assert utils.pdfium_input(read_only) == b"%PDF-1.4 body"
+
+    assert utils.pdfium_input(str(path)) == str(path)